@@ -1,3 +1,4 @@
+import json
 import os
 from dotenv import load_dotenv
 
@@ -20,23 +21,116 @@ DB_PATH = os.getenv("DB_PATH", f"{DB_ROOT_PATH}/lyrics.db")
 # Gemini API configuration
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL_ID = os.getenv("GEMINI_MODEL_ID", "gemma-3-27b-it")
+LLM_REFERENCE_LYRICS_WINDOW = int(
+    os.getenv("LLM_REFERENCE_LYRICS_WINDOW", "0")
+)  # Embedded lyric lines on each side of the current line sent to the LLM as context, 0 to disable
 
 
 # Root path for music files
 MUSIC_ROOT_PATH = os.getenv("MUSIC_ROOT_PATH", "/music")
 
+# Hardware profile written by `main.py --autotune`.
+# Whisper settings are resolved in this order:
+#   1. explicit environment variable (e.g. WHISPER_DEVICE)
+#   2. the autotune profile
+#   3. deployment default from DEFAULT_<NAME> (e.g. DEFAULT_WHISPER_DEVICE),
+#      which is how the Docker image ships its CPU settings
+#   4. the built-in default below
+WHISPER_PROFILE_PATH = os.getenv(
+    "WHISPER_PROFILE_PATH", f"{DB_ROOT_PATH}/whisper_profile.json"
+)
+try:
+    with open(WHISPER_PROFILE_PATH, encoding="utf-8") as _profile_file:
+        WHISPER_PROFILE = json.load(_profile_file).get("settings", {})
+except (OSError, ValueError):
+    WHISPER_PROFILE = {}
+
+
+def _whisper_setting(name, default):
+    """Resolve a Whisper setting from the environment, profile, deployment default or built-in default."""
+    default = os.getenv(f"DEFAULT_{name}", default)
+    return os.getenv(name, str(WHISPER_PROFILE.get(name, default)))
+
+
 # Whisper model configuration
-WHISPER_ENGINE = os.getenv("WHISPER_ENGINE", "faster")  # Options: "openai" or "faster"
-WHISPER_MODEL = os.getenv("WHISPER_MODEL", "medium")  # For openai-whisper
-WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cuda")  # Options: "cuda" or "cpu"
+WHISPER_ENGINE = _whisper_setting("WHISPER_ENGINE", "faster")  # Options: "openai" or "faster"
+WHISPER_MODEL = _whisper_setting("WHISPER_MODEL", "medium")  # For openai-whisper
+WHISPER_DEVICE = _whisper_setting("WHISPER_DEVICE", "cuda")  # Options: "cuda" or "cpu"
 
 # Faster-whisper specific settings (used if WHISPER_ENGINE=faster)
-FASTER_WHISPER_MODEL = os.getenv(
+FASTER_WHISPER_MODEL = _whisper_setting(
     "FASTER_WHISPER_MODEL", "medium"
 )  # small, medium, large-v2, large-v3
-FASTER_WHISPER_COMPUTE_TYPE = os.getenv(
+FASTER_WHISPER_COMPUTE_TYPE = _whisper_setting(
     "FASTER_WHISPER_COMPUTE_TYPE", "int8"
 )  # int8, float16, float32
+FASTER_WHISPER_CPU_THREADS = int(
+    _whisper_setting("FASTER_WHISPER_CPU_THREADS", "0")
+)  # 0 lets CTranslate2 pick
+
+# Autotune calibration settings
+AUTOTUNE_MODELS = os.getenv(
+    "AUTOTUNE_MODELS", "small,medium"
+)  # Comma separated, smallest first; the last one is used as reference
+AUTOTUNE_SAMPLE_FILES = int(os.getenv("AUTOTUNE_SAMPLE_FILES", "3"))
+AUTOTUNE_CLIP_SECONDS = int(os.getenv("AUTOTUNE_CLIP_SECONDS", "30"))
+AUTOTUNE_MIN_CLIP_SECONDS = float(
+    os.getenv("AUTOTUNE_MIN_CLIP_SECONDS", "10")
+)  # Shorter clips (from short tracks) are not used for calibration
+AUTOTUNE_MIN_ACCURACY = float(
+    os.getenv("AUTOTUNE_MIN_ACCURACY", "0.85")
+)  # Minimum similarity to the reference transcription
 
 # Supported audio formats
 AUDIO_EXTENSIONS = {".mp3", ".wav", ".flac", ".m4a", ".ogg", ".opus", ".wma", ".aac"}
+
+# Failure tracking / retry backoff for files that keep failing
+FAILURE_BACKOFF_BASE_HOURS = float(
+    os.getenv("FAILURE_BACKOFF_BASE_HOURS", "24")
+)  # Delay after the first failure, doubled on every further failure
+FAILURE_BACKOFF_MAX_HOURS = float(
+    os.getenv("FAILURE_BACKOFF_MAX_HOURS", "720")
+)  # Upper bound for the retry delay (30 days)
+FAILURE_MAX_ATTEMPTS = int(
+    os.getenv("FAILURE_MAX_ATTEMPTS", "6")
+)  # After this many failures the file is abandoned until requeued
+
+# Lyric enhancement backend
+LYRICS_ENHANCEMENT_MODE = os.getenv(
+    "LYRICS_ENHANCEMENT_MODE", "llm"
+)  # Options: "llm" (Gemini for everything), "hybrid" (local romanization + Gemini translation), "romanize-only" (offline, no Gemini)
+
+# Graceful shutdown on SIGTERM/SIGINT
+SHUTDOWN_GRACE_SECONDS = float(
+    os.getenv("SHUTDOWN_GRACE_SECONDS", "25")
+)  # Keep below the pod's terminationGracePeriodSeconds (30 by default)
+
+# Directory for temporary WAV conversions (kept off the music volume)
+TEMP_AUDIO_PATH = os.getenv("TEMP_AUDIO_PATH", "")  # Empty uses the system temp dir
+
+# Scheduling policy
+SCHEDULE_PRIORITY = os.getenv(
+    "SCHEDULE_PRIORITY", "alphabetical"
+)  # Options: "alphabetical", "newest" (most recent mtime first), "shortest"
+SCHEDULE_PRIORITY_DIRECTORIES = os.getenv(
+    "SCHEDULE_PRIORITY_DIRECTORIES", ""
+)  # Comma separated directories (relative to the processed music directory) handled before everything else
+SCHEDULE_START_TIME = os.getenv(
+    "SCHEDULE_START_TIME", ""
+)  # "HH:MM" to run daily at that time (e.g. an off-peak window); empty runs now and every 24 hours
+RUN_MAX_MINUTES = float(os.getenv("RUN_MAX_MINUTES", "0"))  # 0 = no wall-clock limit
+RUN_MAX_LLM_CALLS = int(os.getenv("RUN_MAX_LLM_CALLS", "0"))  # 0 = no LLM call limit
+
+# Capacity planning (`main.py --plan`)
+PLAN_PROBE_WORKERS = int(os.getenv("PLAN_PROBE_WORKERS", "8"))  # Parallel ffprobe processes
+PLAN_PROBE_TIMEOUT_SECONDS = float(
+    os.getenv("PLAN_PROBE_TIMEOUT_SECONDS", "30")
+)  # A file whose ffprobe takes longer is skipped (e.g. a stalled network mount)
+PLAN_DEFAULT_LLM_CALLS_PER_MINUTE = float(
+    os.getenv("PLAN_DEFAULT_LLM_CALLS_PER_MINUTE", "15")
+)  # Used until real runs have been measured
+
+# Profiling (`main.py --profile`)
+PROFILE_TRACE_PATH = os.getenv(
+    "PROFILE_TRACE_PATH", f"{DB_ROOT_PATH}/traces"
+)  # Directory for Chrome trace files and cProfile dumps
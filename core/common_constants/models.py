@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Integer
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, Text, Float
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 
@@ -16,3 +16,75 @@ class TranscribedFile(Base):
     last_modified_date = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
+
+
+class FailedFile(Base):
+    __tablename__ = "failed_files"
+
+    failure_id = Column(Integer, primary_key=True, autoincrement=True)
+    file_location = Column(String, nullable=False, unique=True)
+    status = Column(String, nullable=False, default="retrying")  # retrying, abandoned
+    attempt_count = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    last_attempt_at = Column(DateTime(timezone=True))
+    next_attempt_at = Column(DateTime(timezone=True))
+    created_date = Column(DateTime(timezone=True), server_default=func.now())
+    last_modified_date = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class TranscriptionCheckpoint(Base):
+    __tablename__ = "transcription_checkpoints"
+
+    checkpoint_id = Column(Integer, primary_key=True, autoincrement=True)
+    file_location = Column(String, nullable=False, unique=True)
+    checkpoint_data = Column(Text, nullable=False)  # JSON transcription result
+    created_date = Column(DateTime(timezone=True), server_default=func.now())
+    last_modified_date = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class AudioProbe(Base):
+    __tablename__ = "audio_probes"
+
+    probe_id = Column(Integer, primary_key=True, autoincrement=True)
+    file_location = Column(String, nullable=False, unique=True)
+    file_size = Column(BigInteger, nullable=False)
+    file_mtime = Column(Float, nullable=False)
+    duration = Column(Float)
+    codec = Column(String)
+    sample_rate = Column(Integer)
+    channels = Column(Integer)
+    created_date = Column(DateTime(timezone=True), server_default=func.now())
+    last_modified_date = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+class EngineMeasurement(Base):
+    __tablename__ = "engine_measurements"
+
+    measurement_id = Column(Integer, primary_key=True, autoincrement=True)
+    file_location = Column(String, nullable=False)
+    engine = Column(String, nullable=False)
+    model_name = Column(String, nullable=False)
+    device = Column(String)
+    compute_type = Column(String)
+    audio_seconds = Column(Float, nullable=False)
+    transcribe_seconds = Column(Float, nullable=False)
+    llm_calls = Column(Integer, nullable=False, default=0)
+    created_date = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class LyricLine(Base):
+    __tablename__ = "lyric_lines"
+
+    line_id = Column(Integer, primary_key=True, autoincrement=True)
+    file_location = Column(String, nullable=False, index=True)
+    start_ms = Column(Integer, nullable=False)
+    end_ms = Column(Integer)
+    original_text = Column(Text, nullable=False)
+    romanization = Column(Text)
+    translation = Column(Text)
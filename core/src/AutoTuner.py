@@ -0,0 +1,366 @@
+import importlib.util
+import json
+import multiprocessing
+import os
+import queue
+import re
+import resource
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from difflib import SequenceMatcher
+from pathlib import Path
+from core.common_constants.constants import (
+    AUTOTUNE_MODELS,
+    AUTOTUNE_SAMPLE_FILES,
+    AUTOTUNE_CLIP_SECONDS,
+    AUTOTUNE_MIN_CLIP_SECONDS,
+    AUTOTUNE_MIN_ACCURACY,
+    WHISPER_PROFILE_PATH,
+)
+from core.src.LyricsGenerator import LyricsGenerator
+from core.utils.logging_utils import get_logger
+from core.utils.tag_utils import TagUtils
+
+logger = get_logger(__name__)
+
+# Compute types worth benchmarking per device, most precise first
+FASTER_COMPUTE_TYPES = {
+    "cuda": ["float16", "int8_float16", "int8"],
+    "cpu": ["float32", "int8"],
+}
+
+
+def _benchmark_candidate(candidate, clip_paths, audio_seconds, result_queue):
+    """
+    Load one engine configuration and transcribe every calibration clip.
+
+    Runs in a separate process so model memory is released between
+    candidates and the peak RSS belongs to this configuration only.
+    """
+    try:
+        load_start = time.perf_counter()
+        generator = LyricsGenerator(
+            engine=candidate["engine"],
+            model_name=candidate["model_name"],
+            device=candidate["device"],
+            compute_type=candidate["compute_type"],
+            cpu_threads=candidate["cpu_threads"],
+        )
+        load_seconds = time.perf_counter() - load_start
+
+        transcripts = []
+        transcribe_start = time.perf_counter()
+        for clip_path in clip_paths:
+            result = generator.transcribe_audio(clip_path)
+            transcripts.append(result["text"])
+        transcribe_seconds = time.perf_counter() - transcribe_start
+
+        result_queue.put(
+            {
+                "load_seconds": load_seconds,
+                "real_time_factor": transcribe_seconds
+                / audio_seconds,
+                # ru_maxrss is reported in kilobytes on Linux
+                "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                / 1024,
+                "transcripts": transcripts,
+            }
+        )
+    except Exception as e:
+        result_queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+class AutoTuner:
+    def __init__(self, profile_path=WHISPER_PROFILE_PATH):
+        """
+        Initialize the hardware benchmark.
+
+        Args:
+            profile_path: Where the winning configuration is written
+        """
+        self.profile_path = Path(profile_path)
+        self.models = [m.strip() for m in AUTOTUNE_MODELS.split(",") if m.strip()]
+
+    def get_available_candidates(self):
+        """
+        Enumerate the engine configurations that can run on this host.
+
+        Returns:
+            List of candidate dicts, reference configuration first
+        """
+        candidates = []
+        cpu_count = os.cpu_count() or 1
+        thread_counts = sorted({max(1, cpu_count // 2), cpu_count}, reverse=True)
+
+        if importlib.util.find_spec("faster_whisper"):
+            import ctranslate2
+
+            devices = ["cpu"]
+            if ctranslate2.get_cuda_device_count() > 0:
+                devices.insert(0, "cuda")
+
+            for device in devices:
+                supported = ctranslate2.get_supported_compute_types(device)
+                compute_types = [
+                    c for c in FASTER_COMPUTE_TYPES[device] if c in supported
+                ]
+                for model_name in reversed(self.models):
+                    for compute_type in compute_types:
+                        # Thread count only matters on CPU
+                        for cpu_threads in thread_counts if device == "cpu" else [0]:
+                            candidates.append(
+                                {
+                                    "engine": "faster",
+                                    "model_name": model_name,
+                                    "device": device,
+                                    "compute_type": compute_type,
+                                    "cpu_threads": cpu_threads,
+                                }
+                            )
+
+        if importlib.util.find_spec("whisper"):
+            import torch
+
+            devices = ["cuda", "cpu"] if torch.cuda.is_available() else ["cpu"]
+            for device in devices:
+                for model_name in reversed(self.models):
+                    candidates.append(
+                        {
+                            "engine": "openai",
+                            "model_name": model_name,
+                            "device": device,
+                            "compute_type": None,
+                            "cpu_threads": None,
+                        }
+                    )
+
+        return candidates
+
+    def prepare_calibration_clips(self, root_directory, work_directory):
+        """
+        Cut short mono 16 kHz clips from files spread across the library.
+
+        Args:
+            root_directory: Music directory to sample from
+            work_directory: Directory the clips are written to
+
+        Clips from tracks too short to give AUTOTUNE_MIN_CLIP_SECONDS of
+        audio after the skipped intro are left out.
+
+        Returns:
+            List of (clip path, clip duration in seconds) tuples
+        """
+        audio_files = LyricsGenerator.get_all_audio_files(root_directory)
+        if not audio_files:
+            return []
+
+        sample_count = min(AUTOTUNE_SAMPLE_FILES, len(audio_files))
+        step = len(audio_files) / sample_count
+        samples = [audio_files[int(i * step)] for i in range(sample_count)]
+
+        clips = []
+        for idx, audio_file in enumerate(samples):
+            # FLAC keeps the clip lossless and small
+            clip_path = Path(work_directory) / f"calibration_{idx}.flac"
+            try:
+                subprocess.run(
+                    [
+                        "ffmpeg",
+                        "-y",
+                        # Skip intros, which are often instrumental
+                        "-ss",
+                        str(AUTOTUNE_CLIP_SECONDS),
+                        "-i",
+                        str(audio_file),
+                        "-t",
+                        str(AUTOTUNE_CLIP_SECONDS),
+                        "-ar",
+                        "16000",
+                        "-ac",
+                        "1",
+                        str(clip_path),
+                    ],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    check=True,
+                )
+            except subprocess.CalledProcessError as e:
+                logger.warning(f"Could not cut calibration clip from {audio_file}: {e}")
+                continue
+
+            # Tracks shorter than the skipped intro plus the clip length give
+            # short or empty clips, which would understate the real-time factor
+            clip_seconds = TagUtils.read_duration(clip_path) or 0.0
+            if clip_seconds < AUTOTUNE_MIN_CLIP_SECONDS:
+                logger.warning(
+                    f"Skipping calibration clip from {audio_file.name}: "
+                    f"only {clip_seconds:.1f}s of audio"
+                )
+                continue
+
+            clips.append((clip_path, clip_seconds))
+            logger.info(
+                f"Calibration clip {idx + 1}: {audio_file.name} ({clip_seconds:.1f}s)"
+            )
+
+        return clips
+
+    @staticmethod
+    def _normalize_words(text):
+        """Lowercase and strip punctuation so only the words are compared."""
+        return re.sub(r"[^\w\s]", "", text.lower()).split()
+
+    def score_accuracy(self, reference_transcripts, transcripts):
+        """
+        Similarity of a candidate's transcripts to the reference transcripts.
+
+        Returns:
+            Mean word-sequence similarity between 0.0 and 1.0
+        """
+        scores = []
+        for reference, candidate in zip(reference_transcripts, transcripts):
+            reference_words = self._normalize_words(reference)
+            candidate_words = self._normalize_words(candidate)
+            if not reference_words and not candidate_words:
+                scores.append(1.0)
+                continue
+            scores.append(
+                SequenceMatcher(None, reference_words, candidate_words).ratio()
+            )
+        return sum(scores) / len(scores) if scores else 0.0
+
+    def run_candidate(self, candidate, clips):
+        """
+        Benchmark a single candidate in a fresh process.
+
+        Args:
+            candidate: Engine configuration from get_available_candidates
+            clips: (clip path, duration) tuples from prepare_calibration_clips
+        """
+        context = multiprocessing.get_context("spawn")
+        result_queue = context.Queue()
+        process = context.Process(
+            target=_benchmark_candidate,
+            args=(
+                candidate,
+                [str(clip_path) for clip_path, _ in clips],
+                sum(clip_seconds for _, clip_seconds in clips),
+                result_queue,
+            ),
+        )
+        process.start()
+
+        # Poll so a worker killed by the OOM killer does not hang the benchmark
+        while True:
+            try:
+                result = result_queue.get(timeout=5)
+                break
+            except queue.Empty:
+                if not process.is_alive():
+                    result = {"error": f"Worker exited with code {process.exitcode}"}
+                    break
+
+        process.join()
+        return result
+
+    def select_best(self, results):
+        """
+        Pick the fastest candidate that is accurate enough.
+
+        Returns:
+            The winning result dict, or None if nothing qualified
+        """
+        qualified = [
+            r
+            for r in results
+            if "error" not in r and r["accuracy"] >= AUTOTUNE_MIN_ACCURACY
+        ]
+        if not qualified:
+            return None
+        return min(qualified, key=lambda r: (r["real_time_factor"], r["peak_rss_mb"]))
+
+    def write_profile(self, best, results):
+        """Write the winning settings in the format constants.py loads."""
+        candidate = best["candidate"]
+        settings = {
+            "WHISPER_ENGINE": candidate["engine"],
+            "WHISPER_DEVICE": candidate["device"],
+        }
+        if candidate["engine"] == "faster":
+            settings["FASTER_WHISPER_MODEL"] = candidate["model_name"]
+            settings["FASTER_WHISPER_COMPUTE_TYPE"] = candidate["compute_type"]
+            settings["FASTER_WHISPER_CPU_THREADS"] = candidate["cpu_threads"]
+        else:
+            settings["WHISPER_MODEL"] = candidate["model_name"]
+
+        profile = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "settings": settings,
+            "benchmark": [
+                {key: value for key, value in r.items() if key != "transcripts"}
+                for r in results
+            ],
+        }
+        self.profile_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.profile_path, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+        logger.info(f"Profile written: {self.profile_path}")
+
+    def run(self, root_directory):
+        """
+        Benchmark every available configuration and save the best one.
+
+        Args:
+            root_directory: Music directory used for the calibration corpus
+
+        Returns:
+            The winning result dict, or None if no configuration qualified
+        """
+        candidates = self.get_available_candidates()
+        if not candidates:
+            logger.error("No Whisper engine is installed on this host")
+            return None
+
+        logger.info(f"Benchmarking {len(candidates)} engine configurations")
+
+        with tempfile.TemporaryDirectory(prefix="verseminer_autotune_") as work_dir:
+            clips = self.prepare_calibration_clips(root_directory, work_dir)
+            if not clips:
+                logger.error(f"No calibration audio found in {root_directory}")
+                return None
+
+            results = []
+            reference_transcripts = None
+            for idx, candidate in enumerate(candidates, 1):
+                logger.info(f"[{idx}/{len(candidates)}] Benchmarking {candidate}")
+                result = self.run_candidate(candidate, clips)
+                result["candidate"] = candidate
+
+                if "error" in result:
+                    logger.warning(f"Candidate failed: {result['error']}")
+                elif reference_transcripts is None:
+                    # The first configuration that works is the reference
+                    reference_transcripts = result["transcripts"]
+                    result["accuracy"] = 1.0
+                else:
+                    result["accuracy"] = self.score_accuracy(
+                        reference_transcripts, result["transcripts"]
+                    )
+
+                if "error" not in result:
+                    logger.info(
+                        f"RTF: {result['real_time_factor']:.3f}, "
+                        f"peak RSS: {result['peak_rss_mb']:.0f} MB, "
+                        f"accuracy: {result['accuracy']:.3f}"
+                    )
+                results.append(result)
+
+        best = self.select_best(results)
+        if best is None:
+            logger.error("No configuration reached the minimum accuracy")
+            return None
+
+        self.write_profile(best, results)
+        return best
@@ -0,0 +1,289 @@
+import json
+import shutil
+import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from core.common_constants.constants import (
+    WHISPER_ENGINE,
+    WHISPER_MODEL,
+    WHISPER_DEVICE,
+    FASTER_WHISPER_MODEL,
+    FASTER_WHISPER_COMPUTE_TYPE,
+    LYRICS_ENHANCEMENT_MODE,
+    PLAN_PROBE_WORKERS,
+    PLAN_PROBE_TIMEOUT_SECONDS,
+    PLAN_DEFAULT_LLM_CALLS_PER_MINUTE,
+    WHISPER_PROFILE_PATH,
+)
+from core.src.LyricsGenerator import LyricsGenerator
+from core.utils.logging_utils import get_logger
+from core.utils.sql_utils import SQLUtils
+
+logger = get_logger(__name__)
+
+
+def probe_audio_file(audio_file):
+    """
+    Read duration, codec, sample rate and channel count with ffprobe.
+
+    Args:
+        audio_file: Path to the audio file
+
+    Returns:
+        Dict with duration, codec, sample_rate and channels (values may be
+        None if ffprobe could not determine them)
+
+    Raises:
+        subprocess.SubprocessError: If ffprobe fails or exceeds
+            PLAN_PROBE_TIMEOUT_SECONDS
+    """
+    completed = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-select_streams",
+            "a:0",
+            "-show_entries",
+            "format=duration:stream=codec_name,sample_rate,channels",
+            "-of",
+            "json",
+            str(audio_file),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=PLAN_PROBE_TIMEOUT_SECONDS,
+    )
+    data = json.loads(completed.stdout or "{}")
+    stream = (data.get("streams") or [{}])[0]
+    duration = data.get("format", {}).get("duration")
+
+    return {
+        "duration": float(duration) if duration not in (None, "N/A") else None,
+        "codec": stream.get("codec_name"),
+        "sample_rate": (
+            int(stream["sample_rate"]) if stream.get("sample_rate") else None
+        ),
+        "channels": stream.get("channels"),
+    }
+
+
+class CapacityPlanner:
+    def __init__(self):
+        """Describe the configured engine so its measurements can be looked up."""
+        self.engine = WHISPER_ENGINE.lower()
+        if self.engine == "faster":
+            self.model_name = FASTER_WHISPER_MODEL
+            self.compute_type = FASTER_WHISPER_COMPUTE_TYPE
+        else:
+            self.model_name = WHISPER_MODEL
+            self.compute_type = None
+        self.device = WHISPER_DEVICE.lower()
+
+    def probe_pending_files(self, audio_files):
+        """
+        Probe every file, reusing cached results whose size and mtime match.
+
+        Args:
+            audio_files: List of Path objects
+
+        Returns:
+            List of probe dicts (one per file that could be probed)
+        """
+        cached = SQLUtils.get_audio_probes()
+        results = []
+        to_probe = []
+
+        for audio_file in audio_files:
+            try:
+                stat = audio_file.stat()
+            except OSError as e:
+                logger.warning(f"Skipping {audio_file}: {e}")
+                continue
+            location = LyricsGenerator.get_relative_path(audio_file)
+            probe = cached.get(location)
+            if (
+                probe is not None
+                and probe.file_size == stat.st_size
+                and probe.file_mtime == stat.st_mtime
+            ):
+                results.append(
+                    {
+                        "file_location": location,
+                        "duration": probe.duration,
+                        "codec": probe.codec,
+                        "sample_rate": probe.sample_rate,
+                        "channels": probe.channels,
+                    }
+                )
+            else:
+                to_probe.append((audio_file, location, stat))
+
+        logger.info(
+            f"{len(results)} probe results cached, probing {len(to_probe)} files "
+            f"with {PLAN_PROBE_WORKERS} workers"
+        )
+
+        def probe(entry):
+            audio_file, location, stat = entry
+            try:
+                probe_result = probe_audio_file(audio_file)
+            except (subprocess.SubprocessError, OSError, ValueError) as e:
+                logger.warning(f"ffprobe failed for {audio_file}: {e}")
+                return None
+            probe_result.update(
+                file_location=location,
+                file_size=stat.st_size,
+                file_mtime=stat.st_mtime,
+            )
+            return probe_result
+
+        with ThreadPoolExecutor(max_workers=PLAN_PROBE_WORKERS) as executor:
+            new_results = [r for r in executor.map(probe, to_probe) if r is not None]
+
+        SQLUtils.save_audio_probes(new_results)
+        results.extend(new_results)
+        return results
+
+    def _profile_real_time_factor(self):
+        """Real-time factor of the configured engine from the autotune profile, if any."""
+        try:
+            with open(WHISPER_PROFILE_PATH, encoding="utf-8") as f:
+                benchmark = json.load(f).get("benchmark", [])
+        except (OSError, ValueError):
+            return None
+
+        for entry in benchmark:
+            candidate = entry.get("candidate", {})
+            if (
+                "real_time_factor" in entry
+                and candidate.get("engine") == self.engine
+                and candidate.get("model_name") == self.model_name
+                and candidate.get("device") == self.device
+                and candidate.get("compute_type") == self.compute_type
+            ):
+                return entry["real_time_factor"]
+        return None
+
+    def estimate_rates(self, measurements):
+        """
+        Work out the real-time factor and LLM calls per audio minute.
+
+        Measured runs of the configured engine are preferred, then the
+        autotune profile, then PLAN_DEFAULT_LLM_CALLS_PER_MINUTE for LLM calls.
+
+        Returns:
+            Tuple of (real_time_factor or None, rtf source, calls per minute,
+            calls source)
+        """
+        configured = [
+            m
+            for m in measurements
+            if m.engine == self.engine
+            and m.model_name == self.model_name
+            and m.device == self.device
+            and m.compute_type == self.compute_type
+        ]
+
+        rtf_source = "unknown (run --autotune or a normal run first)"
+        if configured:
+            audio_seconds = sum(m.audio_seconds for m in configured)
+            real_time_factor = (
+                sum(m.transcribe_seconds for m in configured) / audio_seconds
+            )
+            files = sum(m.files for m in configured)
+            rtf_source = f"measured over {files} files"
+        else:
+            real_time_factor = self._profile_real_time_factor()
+            if real_time_factor is not None:
+                rtf_source = "autotune profile"
+
+        if LYRICS_ENHANCEMENT_MODE.lower() == "romanize-only":
+            return real_time_factor, rtf_source, 0.0, "romanize-only mode"
+
+        audio_seconds = sum(m.audio_seconds for m in measurements)
+        if audio_seconds:
+            calls_per_minute = sum(m.llm_calls for m in measurements) / (
+                audio_seconds / 60
+            )
+            return real_time_factor, rtf_source, calls_per_minute, "measured"
+
+        return (
+            real_time_factor,
+            rtf_source,
+            PLAN_DEFAULT_LLM_CALLS_PER_MINUTE,
+            "default estimate",
+        )
+
+    def run(self, root_directory):
+        """
+        Probe the remaining backlog and print a capacity report.
+
+        Args:
+            root_directory: Music directory to plan for
+        """
+        if shutil.which("ffprobe") is None:
+            logger.error("ffprobe was not found on PATH; install ffmpeg to use --plan")
+            return
+
+        pending_files = LyricsGenerator.get_pending_audio_files(root_directory)
+        probes = self.probe_pending_files(pending_files)
+        measurements = SQLUtils.get_engine_measurement_totals()
+
+        durations = [p["duration"] for p in probes if p["duration"]]
+        audio_hours = sum(durations) / 3600
+        unknown = len(pending_files) - len(durations)
+
+        real_time_factor, rtf_source, calls_per_minute, calls_source = (
+            self.estimate_rates(measurements)
+        )
+
+        print("=" * 60)
+        print("Capacity plan for the remaining backlog")
+        print("=" * 60)
+        print(f"Pending files:     {len(pending_files)}")
+        print(f"Total audio:       {audio_hours:.1f} hours")
+        if unknown:
+            print(f"Unknown duration:  {unknown} files (not included above)")
+
+        codecs = Counter(p["codec"] or "unknown" for p in probes)
+        print(
+            "Codecs:            "
+            + ", ".join(f"{codec} {count}" for codec, count in codecs.most_common())
+        )
+        sample_rates = Counter(p["sample_rate"] or "unknown" for p in probes)
+        print(
+            "Sample rates:      "
+            + ", ".join(f"{rate} {count}" for rate, count in sample_rates.most_common())
+        )
+
+        print("-" * 60)
+        configuration = f"{self.engine}/{self.model_name} on {self.device}"
+        if self.compute_type:
+            configuration += f" ({self.compute_type})"
+        print(f"Engine:            {configuration}")
+        if real_time_factor is None:
+            print(f"Real-time factor:  {rtf_source}")
+        else:
+            print(f"Real-time factor:  {real_time_factor:.3f} ({rtf_source})")
+            print(f"Projected runtime: {audio_hours * real_time_factor:.1f} hours")
+
+        projected_calls = audio_hours * 60 * calls_per_minute
+        print(
+            f"LLM calls:         ~{projected_calls:,.0f} "
+            f"({calls_per_minute:.1f} per audio minute, {calls_source})"
+        )
+
+        if measurements:
+            print("-" * 60)
+            print("Measured real-time factors:")
+            for m in measurements:
+                name = f"{m.engine}/{m.model_name} on {m.device}"
+                if m.compute_type:
+                    name += f" ({m.compute_type})"
+                print(
+                    f"  {name}: {m.transcribe_seconds / m.audio_seconds:.3f} "
+                    f"over {m.files} files"
+                )
+        print("=" * 60)
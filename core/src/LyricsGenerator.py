@@ -1,5 +1,7 @@
 import os
 import subprocess
+import tempfile
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -9,48 +11,108 @@ from core.common_constants.constants import (
     WHISPER_DEVICE,
     FASTER_WHISPER_MODEL,
     FASTER_WHISPER_COMPUTE_TYPE,
+    FASTER_WHISPER_CPU_THREADS,
     AUDIO_EXTENSIONS,
     MUSIC_ROOT_PATH,
+    TEMP_AUDIO_PATH,
+    LLM_REFERENCE_LYRICS_WINDOW,
 )
-from core.utils.llm_utils import LLMUtils
+from core.utils.enhancement_utils import get_enhancement_backend
+from core.utils.llm_utils import RateLimitError
 from core.utils.logging_utils import get_logger
+from core.utils.profiling_utils import is_profiling_enabled, span, track, traced
+from core.utils.scheduling_utils import RunBudget, order_candidates
+from core.utils.shutdown_utils import (
+    StopRequested,
+    is_shutdown_requested,
+    register_temp_file,
+    unregister_temp_file,
+)
 from core.utils.sql_utils import SQLUtils
+from core.utils.tag_utils import TagUtils
 
 logger = get_logger(__name__)
 
+# Enhancement lines kept per lyric line: romanization and translation
+MAX_ENHANCEMENT_LINES = 2
+
 
 class LyricsGenerator:
-    def __init__(self):
-        """Initialize Whisper model (either openai-whisper or faster-whisper) and LLM utilities."""
-        self.engine_type = WHISPER_ENGINE.lower()
+    def __init__(
+        self,
+        engine=None,
+        model_name=None,
+        device=None,
+        compute_type=None,
+        cpu_threads=None,
+    ):
+        """
+        Initialize Whisper model (either openai-whisper or faster-whisper).
+
+        All arguments default to the configured constants; they are only
+        overridden when benchmarking alternative configurations.
+
+        Args:
+            engine: "openai" or "faster"
+            model_name: Whisper model name for the selected engine
+            device: "cuda" or "cpu"
+            compute_type: Faster-whisper compute type (int8, float16, ...)
+            cpu_threads: Faster-whisper CPU thread count (0 = automatic)
+        """
+        self.engine_type = (engine or WHISPER_ENGINE).lower()
+        device = (device or WHISPER_DEVICE).lower()
 
         if self.engine_type == "faster":
+            model_name = model_name or FASTER_WHISPER_MODEL
+            compute_type = compute_type or FASTER_WHISPER_COMPUTE_TYPE
+            cpu_threads = (
+                FASTER_WHISPER_CPU_THREADS if cpu_threads is None else cpu_threads
+            )
             logger.info(
-                f"Loading Faster-Whisper model: {FASTER_WHISPER_MODEL} (compute_type: {FASTER_WHISPER_COMPUTE_TYPE})"
+                f"Loading Faster-Whisper model: {model_name} (compute_type: {compute_type}, cpu_threads: {cpu_threads or 'auto'})"
             )
             from faster_whisper import WhisperModel
 
             self.model = WhisperModel(
-                FASTER_WHISPER_MODEL,
-                device="cpu" if WHISPER_DEVICE.lower() == "cpu" else "cuda",
-                compute_type=FASTER_WHISPER_COMPUTE_TYPE,
+                model_name,
+                device="cpu" if device == "cpu" else "cuda",
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
             )
             logger.info("Faster-Whisper model loaded successfully")
         elif self.engine_type == "openai":
-            logger.info(f"Loading OpenAI Whisper model: {WHISPER_MODEL}")
+            model_name = model_name or WHISPER_MODEL
+            logger.info(f"Loading OpenAI Whisper model: {model_name}")
             import whisper
 
-            self.model = whisper.load_model(WHISPER_MODEL, device=WHISPER_DEVICE)
+            self.model = whisper.load_model(model_name, device=device)
             logger.info("OpenAI Whisper model loaded successfully")
         else:
             raise ValueError(
-                f"Unsupported WHISPER_ENGINE: {WHISPER_ENGINE}. Use 'openai' or 'faster'"
+                f"Unsupported WHISPER_ENGINE: {self.engine_type}. Use 'openai' or 'faster'"
             )
 
-        self.llm = LLMUtils()
+        self.model_name = model_name
+        self.device = device
+        self.compute_type = compute_type if self.engine_type == "faster" else None
+        self._llm = None
         self.sql_utils = SQLUtils()
+        self.run_budget = None
 
-    def get_all_audio_files(self, root_directory):
+    @property
+    def llm(self):
+        """
+        Lyric enhancement backend, created on first use.
+
+        Transcription-only callers such as the autotune benchmark never
+        touch it, so they run without an LLM client or API key.
+        """
+        if self._llm is None:
+            self._llm = get_enhancement_backend()
+        return self._llm
+
+    @staticmethod
+    def get_all_audio_files(root_directory):
         """
         Recursively find all audio files in the directory.
 
@@ -68,7 +130,8 @@ class LyricsGenerator:
 
         return sorted(audio_files)
 
-    def get_relative_path(self, absolute_path):
+    @staticmethod
+    def get_relative_path(absolute_path):
         """Convert absolute path to relative path from MUSIC_ROOT_PATH."""
         try:
             return str(Path(absolute_path).relative_to(MUSIC_ROOT_PATH))
@@ -76,38 +139,104 @@ class LyricsGenerator:
             # If path is not relative to MUSIC_ROOT_PATH, return as-is
             return str(absolute_path)
 
+    def record_measurement(
+        self, audio_file, relative_path, transcribe_seconds, llm_calls
+    ):
+        """
+        Store the transcription speed and LLM usage of a file for capacity planning.
+
+        Measurement problems are logged and never fail the file.
+        """
+        try:
+            audio_seconds = TagUtils.read_duration(audio_file)
+            if not audio_seconds:
+                return
+            self.sql_utils.add_engine_measurement(
+                file_location=relative_path,
+                engine=self.engine_type,
+                model_name=self.model_name,
+                device=self.device,
+                compute_type=self.compute_type,
+                audio_seconds=audio_seconds,
+                transcribe_seconds=transcribe_seconds,
+                llm_calls=llm_calls,
+            )
+        except Exception as e:
+            logger.warning(f"Could not record measurement for {audio_file.name}: {e}")
+
+    def get_stop_reason(self):
+        """
+        Check whether the current run has to stop early.
+
+        Returns:
+            Reason string on shutdown or an exhausted run budget, otherwise None
+        """
+        if is_shutdown_requested():
+            return "shutdown requested"
+        if self.run_budget is not None:
+            return self.run_budget.exhausted_reason()
+        return None
+
     def _to_wav(self, audio_path: Path) -> Path:
-        """Convert audio to mono 16k WAV for Whisper."""
-        wav_path = audio_path.with_suffix(".wav")
-        logger.debug(f"Converting {audio_path.name} to WAV format")
+        """
+        Convert audio to mono 16k WAV for Whisper.
 
-        subprocess.run(
-            [
-                "ffmpeg",
-                "-y",
-                "-i",
-                str(audio_path),
-                "-ar",
-                "16000",
-                "-ac",
-                "1",
-                str(wav_path),
-            ],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=True,
+        The WAV is written to TEMP_AUDIO_PATH rather than next to the audio
+        file, so an interrupted conversion never leaves partial files on the
+        music volume (or overwrites a source .wav).
+        """
+        fd, temp_name = tempfile.mkstemp(
+            suffix=".wav", prefix="verseminer_", dir=TEMP_AUDIO_PATH or None
         )
+        os.close(fd)
+        wav_path = Path(temp_name)
+        register_temp_file(wav_path)
+        logger.debug(f"Converting {audio_path.name} to WAV format")
+
+        try:
+            with span("to_wav", input_bytes=audio_path.stat().st_size) as span_args:
+                subprocess.run(
+                    [
+                        "ffmpeg",
+                        "-y",
+                        "-i",
+                        str(audio_path),
+                        "-ar",
+                        "16000",
+                        "-ac",
+                        "1",
+                        str(wav_path),
+                    ],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    check=True,
+                    # Own session, so Ctrl+C to the process group lets the
+                    # conversion finish instead of killing ffmpeg
+                    start_new_session=True,
+                )
+                span_args["output_bytes"] = wav_path.stat().st_size
+        except Exception:
+            wav_path.unlink(missing_ok=True)
+            unregister_temp_file(wav_path)
+            raise
         return wav_path
 
-    def transcribe_audio(self, audio_file_path):
+    @traced("transcribe_audio")
+    def transcribe_audio(self, audio_file_path, resume_from=None):
         """
         Transcribe audio file using either OpenAI Whisper or Faster-Whisper.
 
         Args:
             audio_file_path: Path to the audio file
+            resume_from: Partial result from a checkpoint; faster-whisper
+                continues after its last segment
 
         Returns:
             Transcription result with timestamps
+
+        Raises:
+            StopRequested: If the run has to stop mid-transcription; the
+                exception carries the segments transcribed so far
         """
         logger.info(f"Transcribing: {audio_file_path}")
 
@@ -115,51 +244,81 @@ class LyricsGenerator:
             # Faster-whisper requires WAV conversion
             wav_path = self._to_wav(Path(audio_file_path))
             try:
-                # Single transcription pass with auto-detection
-                segments, info = self.model.transcribe(
-                    str(wav_path),
-                    task="transcribe",
-                    language=None,  # auto-detect
-                )
-
-                # Only override Urdu with Hindi
-                if info.language == "ur":
-                    logger.debug("Detected Urdu language, overriding with Hindi")
-                    segments, info = self.model.transcribe(
-                        str(wav_path),
-                        task="transcribe",
-                        language="hi",
+                if resume_from and resume_from["segments"]:
+                    resume_start = resume_from["segments"][-1]["end"]
+                    logger.info(
+                        f"Resuming transcription from checkpoint at {resume_start:.1f}s"
                     )
+                    with span("detect", resumed_at=resume_start):
+                        segments, info = self.model.transcribe(
+                            str(wav_path),
+                            task="transcribe",
+                            language=resume_from["language"],
+                            clip_timestamps=[resume_start],
+                        )
+                else:
+                    resume_from = None
+
+                    with span("detect") as span_args:
+                        # Single transcription pass with auto-detection
+                        segments, info = self.model.transcribe(
+                            str(wav_path),
+                            task="transcribe",
+                            language=None,  # auto-detect
+                        )
+
+                        # Only override Urdu with Hindi
+                        if info.language == "ur":
+                            logger.debug("Detected Urdu language, overriding with Hindi")
+                            segments, info = self.model.transcribe(
+                                str(wav_path),
+                                task="transcribe",
+                                language="hi",
+                            )
+                        span_args["language"] = info.language
 
                 # Convert faster-whisper segments to openai-whisper format
                 # Note: segments is a generator, so we consume it once
                 result = {
                     "text": "",
-                    "segments": [],
+                    "segments": list(resume_from["segments"]) if resume_from else [],
+                    "language": info.language,
+                    "complete": False,
                 }
 
-                text_parts = []
                 for seg in segments:
                     result["segments"].append(
                         {"start": seg.start, "end": seg.end, "text": seg.text}
                     )
-                    text_parts.append(seg.text)
-
-                result["text"] = " ".join(text_parts)
+                    # Segments are decoded lazily, so this is a cheap place to stop
+                    stop_reason = self.get_stop_reason()
+                    if stop_reason:
+                        result["text"] = " ".join(
+                            s["text"] for s in result["segments"]
+                        )
+                        raise StopRequested(
+                            f"Transcription interrupted at {seg.end:.1f}s ({stop_reason})",
+                            partial_result=result,
+                        )
+
+                result["text"] = " ".join(s["text"] for s in result["segments"])
+                result["complete"] = True
 
                 return result
             finally:
                 if wav_path.exists():
                     wav_path.unlink()
                     logger.debug(f"Cleaned up temporary WAV file: {wav_path.name}")
+                unregister_temp_file(wav_path)
         else:
-            # OpenAI Whisper
+            # OpenAI Whisper transcribes in one call and cannot be resumed
             result = self.model.transcribe(
                 str(audio_file_path),
                 task="transcribe",
                 word_timestamps=True,
                 verbose=False,
             )
+            result["complete"] = True
             return result
 
     def format_lrc_timestamp(self, seconds):
@@ -172,59 +331,199 @@ class LyricsGenerator:
         Returns:
             Formatted timestamp string
         """
-        minutes = int(seconds // 60)
-        secs = seconds % 60
-        return f"[{minutes:02d}:{secs:05.2f}]"
+        centiseconds = round(seconds * 100)
+        minutes, centiseconds = divmod(centiseconds, 6000)
+        return f"[{minutes:02d}:{centiseconds / 100:05.2f}]"
+
+    def create_lrc_header(self, tags, source):
+        """
+        Create the LRC metadata lines.
 
-    def create_lrc_content(self, transcription_result, audio_file_name):
+        Args:
+            tags: Tag dict from TagUtils.read_tags (or None)
+            source: Who produced the lyrics, written to the [by:] tag
+
+        Returns:
+            List of LRC metadata lines followed by a blank line
+        """
+        tags = tags or TagUtils.empty_tags()
+        return [
+            f"[ti:{tags['title'] or 'Unknown Title'}]",
+            f"[ar:{tags['artist'] or 'Unknown Artist'}]",
+            f"[al:{tags['album'] or 'Unknown Album'}]",
+            f"[by:{source} - {datetime.now().strftime('%Y-%m-%d')}]",
+            "",
+        ]
+
+    def format_lrc(self, lyric_lines, tags, source):
         """
-        Create LRC file content from Whisper transcription with per-line enhancement.
+        Format lyric lines as LRC file content.
+
+        Every original line gets a distinct timestamp (lines that would round
+        to the same centisecond are moved 10 ms apart), so lines sharing a
+        timestamp are always one lyric and its enhancements.
+
+        Args:
+            lyric_lines: Lyric line dicts from enhance_segments or embedded_lyric_lines
+            tags: Tag dict from TagUtils.read_tags (or None)
+            source: Who produced the lyrics, written to the [by:] tag
+
+        Returns:
+            LRC formatted string
+        """
+        lrc_lines = self.create_lrc_header(tags, source)
+        previous_centiseconds = -1
+        for lyric_line in lyric_lines:
+            centiseconds = max(
+                round(lyric_line["start"] * 100), previous_centiseconds + 1
+            )
+            previous_centiseconds = centiseconds
+            timestamp = self.format_lrc_timestamp(centiseconds / 100)
+            lrc_lines.append(f"{timestamp}{lyric_line['text']}")
+            for enhanced_line in lyric_line["enhancements"]:
+                lrc_lines.append(f"{timestamp}{enhanced_line}")
+        return "\n".join(lrc_lines)
+
+    @staticmethod
+    def lyric_lines_from_lrc(lrc_content):
+        """
+        Parse an LRC file written by format_lrc back into lyric lines.
+
+        Lines sharing a timestamp are grouped: the first is the original
+        lyric, the following ones (at most MAX_ENHANCEMENT_LINES) its
+        enhancements. format_lrc never gives two original lines the same
+        timestamp; for older files that did, any line beyond the
+        enhancement limit starts a new lyric line.
+
+        Args:
+            lrc_content: LRC file content
+
+        Returns:
+            List of lyric line dicts
+        """
+        lyric_lines = []
+        for seconds, text in TagUtils.parse_lrc_lyrics(lrc_content) or []:
+            if (
+                lyric_lines
+                and lyric_lines[-1]["start"] == seconds
+                and len(lyric_lines[-1]["enhancements"]) < MAX_ENHANCEMENT_LINES
+            ):
+                if text:
+                    lyric_lines[-1]["enhancements"].append(text)
+                continue
+            if lyric_lines:
+                lyric_lines[-1]["end"] = seconds
+            lyric_lines.append(
+                {"start": seconds, "end": None, "text": text, "enhancements": []}
+            )
+        return lyric_lines
+
+    def embedded_lyric_lines(self, tags):
+        """
+        Convert synced lyrics embedded in the audio file to lyric lines.
+
+        Args:
+            tags: Tag dict from TagUtils.read_tags with synced_lyrics set
+
+        Returns:
+            List of lyric line dicts; each line ends where the next begins
+        """
+        synced_lyrics = tags["synced_lyrics"]
+        return [
+            {
+                "start": seconds,
+                "end": (
+                    synced_lyrics[idx + 1][0] if idx + 1 < len(synced_lyrics) else None
+                ),
+                "text": text,
+                "enhancements": [],
+            }
+            for idx, (seconds, text) in enumerate(synced_lyrics)
+        ]
+
+    def enhance_segments(
+        self, transcription_result, audio_file_name, tags=None, lyric_lines=None
+    ):
+        """
+        Add transliteration and translation to every transcribed segment.
 
         Args:
             transcription_result: Result from Whisper transcription
             audio_file_name: Name of the audio file for LLM context
+            tags: Tag dict from TagUtils.read_tags; the description and any
+                embedded unsynced lyrics are given to the LLM as context
+            lyric_lines: Lines finished by an earlier, interrupted run.
+                Enhancement continues after them, and every finished line
+                is appended to this list, so after StopRequested or
+                RateLimitError it holds exactly the lines that are done.
 
         Returns:
-            LRC formatted string with transliteration and translation
+            List of lyric line dicts with start, end, text and enhancements
+            (romanization first, then translation)
         """
-        lrc_lines = []
-
-        # Add metadata
-        lrc_lines.append("[ti:Unknown Title]")
-        lrc_lines.append("[ar:Unknown Artist]")
-        lrc_lines.append("[al:Unknown Album]")
-        lrc_lines.append(f"[by:Whisper AI - {datetime.now().strftime('%Y-%m-%d')}]")
-        lrc_lines.append("")
+        if lyric_lines is None:
+            lyric_lines = []
+        if lyric_lines:
+            logger.info(f"Resuming enhancement after line {len(lyric_lines)}")
+        song_context = (
+            TagUtils.describe(tags, audio_file_name) if tags else audio_file_name
+        )
+        reference_lines = [
+            line.strip()
+            for line in ((tags or {}).get("unsynced_lyrics") or "").splitlines()
+            if line.strip()
+        ]
+        if reference_lines and LLM_REFERENCE_LYRICS_WINDOW:
+            logger.info("Using embedded unsynced lyrics as LLM context")
 
         # Process each segment with LLM
         total_segments = len(transcription_result["segments"])
-        for idx, segment in enumerate(transcription_result["segments"], 1):
-            timestamp = self.format_lrc_timestamp(segment["start"])
+        segments = transcription_result["segments"][len(lyric_lines) :]
+        for idx, segment in enumerate(segments, len(lyric_lines) + 1):
             text = segment["text"].strip()
-
-            # Add original lyric line
-            lrc_lines.append(f"{timestamp}{text}")
+            lyric_line = {
+                "start": segment["start"],
+                "end": segment["end"],
+                "text": text,
+                "enhancements": [],
+            }
 
             # Skip empty lines
             if not text:
+                lyric_lines.append(lyric_line)
                 continue
 
+            stop_reason = self.get_stop_reason()
+            if stop_reason:
+                raise StopRequested(
+                    f"Enhancement interrupted at line {idx}/{total_segments} ({stop_reason})"
+                )
+
             # Process with LLM for transliteration and translation
             logger.debug(f"Processing line {idx}/{total_segments}: {text}")
-            enhancement = self.llm.detect_and_enhance_lyric_line(text, audio_file_name)
+            reference_lyrics = TagUtils.reference_excerpt(
+                reference_lines, text, (idx - 1) / max(1, total_segments - 1)
+            )
+            with span("llm_call", line=idx, chars=len(text)):
+                enhancement = self.llm.detect_and_enhance_lyric_line(
+                    text, song_context, reference_lyrics
+                )
             logger.info(
                 f"Enhanced line {idx}/{total_segments}, original: '{text}', enhancement: '{enhancement}'"
             )
 
-            # If we got enhancement (non-English), add it with same timestamp
+            # If we got enhancement (non-English), add it with same timestamp.
+            # Extra lines are LLM chatter and would break lyric_lines_from_lrc.
             if enhancement:
-                for enhanced_line in enhancement.split("\n"):
-                    enhanced_line = enhanced_line.strip()
-                    if enhanced_line:
-                        lrc_lines.append(f"{timestamp}{enhanced_line}")
+                enhanced_lines = [
+                    line.strip() for line in enhancement.split("\n") if line.strip()
+                ]
+                lyric_line["enhancements"] = enhanced_lines[:MAX_ENHANCEMENT_LINES]
+            lyric_lines.append(lyric_line)
 
-        return "\n".join(lrc_lines)
+        return lyric_lines
 
+    @traced("save_lrc_file")
     def save_lrc_file(self, audio_file_path, lrc_content):
         """
         Save LRC content to file with same name as audio file.
@@ -234,57 +533,204 @@ class LyricsGenerator:
             lrc_content: LRC formatted content
         """
         lrc_file_path = Path(audio_file_path).with_suffix(".lrc")
-        with open(lrc_file_path, "w", encoding="utf-8") as f:
-            f.write(lrc_content)
+
+        # Write then rename, so an interrupted write never leaves a truncated LRC
+        temp_path = lrc_file_path.with_suffix(".lrc.tmp")
+        register_temp_file(temp_path)
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(lrc_content)
+            os.replace(temp_path, lrc_file_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+            unregister_temp_file(temp_path)
         logger.info(f"LRC file saved: {lrc_file_path}")
 
+    @staticmethod
+    def get_pending_audio_files(root_directory):
+        """
+        Find the audio files that still need an LRC file.
+
+        Files that already have an LRC, and files in retry backoff, are left out.
+
+        Args:
+            root_directory: Root directory to search
+
+        Returns:
+            List of Path objects, in no particular order
+        """
+        audio_files = LyricsGenerator.get_all_audio_files(root_directory)
+
+        # Files that failed recently (or too often) are skipped until their backoff expires
+        blocked_locations = SQLUtils.get_blocked_locations()
+
+        pending = []
+        skipped_existing = 0
+        skipped_backoff = 0
+        for audio_file in audio_files:
+            if audio_file.with_suffix(".lrc").exists():
+                skipped_existing += 1
+            elif LyricsGenerator.get_relative_path(audio_file) in blocked_locations:
+                skipped_backoff += 1
+            else:
+                pending.append(audio_file)
+
+        logger.info(
+            f"\nFound {len(audio_files)} audio files: {skipped_existing} with LRC, "
+            f"{skipped_backoff} in retry backoff, {len(pending)} to process\n"
+        )
+        return pending
+
+    def process_file(self, audio_file, relative_path):
+        """
+        Generate the LRC file for a single audio file and record it.
+
+        Args:
+            audio_file: Path to the audio file
+            relative_path: Location stored in the database
+
+        Raises:
+            StopRequested: If the run has to stop; a finished transcription
+                is checkpointed before this is raised
+            RateLimitError: If the LLM quota is exhausted
+        """
+        tags = TagUtils.read_tags(audio_file)
+
+        if tags["synced_lyrics"]:
+            # Embedded synced lyrics are better than anything Whisper produces
+            logger.info("Using embedded synced lyrics, skipping transcription")
+            lyric_lines = self.embedded_lyric_lines(tags)
+            lrc_content = self.format_lrc(lyric_lines, tags, "Embedded lyrics")
+        else:
+            checkpoint = self.sql_utils.get_checkpoint(relative_path)
+            if checkpoint and checkpoint["complete"]:
+                logger.info("Using checkpointed transcription")
+                result = checkpoint
+            else:
+                # Transcribe audio
+                transcribe_start = time.perf_counter()
+                result = self.transcribe_audio(audio_file, resume_from=checkpoint)
+                transcribe_seconds = time.perf_counter() - transcribe_start
+
+            # Create LRC content with per-line LLM enhancement
+            logger.info("Enhancing lyrics with Gemini (per-line processing)...")
+            llm_calls_before = self.llm.llm_call_count
+            lyric_lines = list(checkpoint.get("lyric_lines", [])) if checkpoint else []
+            try:
+                self.enhance_segments(result, audio_file.name, tags, lyric_lines)
+            except (StopRequested, RateLimitError):
+                # Keep the transcription and the lines enhanced so far, so the
+                # next run only pays for the remaining LLM calls
+                self.sql_utils.save_checkpoint(relative_path, result, lyric_lines)
+                raise
+
+            lrc_content = self.format_lrc(lyric_lines, tags, "Whisper AI")
+
+            # Only uninterrupted runs give a meaningful real-time factor
+            if checkpoint is None:
+                self.record_measurement(
+                    audio_file,
+                    relative_path,
+                    transcribe_seconds,
+                    self.llm.llm_call_count - llm_calls_before,
+                )
+
+        # Save LRC file
+        self.save_lrc_file(audio_file, lrc_content)
+
+        # Record in database
+        with span("db_commit"):
+            self.sql_utils.add_file(
+                file_location=relative_path,
+                date_transcribed=datetime.now(),
+                date_added=datetime.now(),
+            )
+
+            self.sql_utils.index_lyrics(relative_path, lyric_lines)
+            self.sql_utils.clear_failure(relative_path)
+            self.sql_utils.delete_checkpoint(relative_path)
+
     def process_directory(self, root_directory):
         """
         Process all audio files in directory and generate LRC files.
 
+        Files are processed in the order set by SCHEDULE_PRIORITY and
+        SCHEDULE_PRIORITY_DIRECTORIES. The run stops cleanly once
+        RUN_MAX_MINUTES or RUN_MAX_LLM_CALLS is reached; the next run
+        continues with the remaining files.
+
         Args:
             root_directory: Root directory to process
         """
-        audio_files = self.get_all_audio_files(root_directory)
+        with span("scan") as span_args:
+            audio_files = order_candidates(
+                self.get_pending_audio_files(root_directory),
+                root_directory=root_directory,
+            )
+            span_args["pending_files"] = len(audio_files)
         total_files = len(audio_files)
+        processed_files = 0
 
-        logger.info(f"\nFound {total_files} audio files to process\n")
+        self.run_budget = RunBudget(lambda: self.llm.llm_call_count)
 
         for idx, audio_file in enumerate(audio_files, 1):
+            stop_reason = self.get_stop_reason()
+            if stop_reason:
+                logger.info(
+                    f"Stopping run ({stop_reason}), {total_files - idx + 1} files left for the next run"
+                )
+                break
+
             try:
                 relative_path = self.get_relative_path(audio_file)
 
-                # Check if LRC file exists, skip if it does
-                lrc_file_path = audio_file.with_suffix(".lrc")
-                if lrc_file_path.exists():
-                    logger.info(
-                        f"[{idx}/{total_files}] Skipping (LRC exists): {audio_file.name}"
-                    )
-                    continue
-
                 logger.info(f"\n[{idx}/{total_files}] Processing: {audio_file.name}")
 
-                # Transcribe audio
-                result = self.transcribe_audio(audio_file)
-
-                # Create LRC content with per-line LLM enhancement
-                logger.info("Enhancing lyrics with Gemini (per-line processing)...")
-                lrc_content = self.create_lrc_content(result, audio_file.name)
+                profile_args = {}
+                if is_profiling_enabled():
+                    profile_args = {
+                        "audio_bytes": audio_file.stat().st_size,
+                        "audio_seconds": TagUtils.read_duration(audio_file),
+                    }
+                with track(relative_path, **profile_args):
+                    self.process_file(audio_file, relative_path)
 
-                # Save LRC file
-                self.save_lrc_file(audio_file, lrc_content)
+                processed_files += 1
+                logger.info(f"Successfully processed: {audio_file.name}")
 
-                # Record in database
-                self.sql_utils.add_file(
-                    file_location=relative_path,
-                    date_transcribed=datetime.now(),
-                    date_added=datetime.now(),
-                )
+            except StopRequested as e:
+                logger.warning(f"Stopped {audio_file.name}: {e}")
+                if e.partial_result is not None:
+                    self.sql_utils.save_checkpoint(relative_path, e.partial_result)
+                    logger.info(f"Checkpoint saved for {audio_file.name}")
+                break
 
-                logger.info(f"Successfully processed: {audio_file.name}")
+            except RateLimitError:
+                # Quota problems are not the file's fault; abort the run instead
+                raise
 
             except Exception as e:
+                if is_shutdown_requested():
+                    # Errors during shutdown (e.g. a killed subprocess) are not the file's fault
+                    logger.warning(
+                        f"Stopped {audio_file.name} during shutdown: {type(e).__name__}: {e}"
+                    )
+                    break
+
                 logger.error(f"Error processing {audio_file}: {e}", exc_info=True)
+                failure = self.sql_utils.record_failure(
+                    relative_path, f"{type(e).__name__}: {e}"[:2000]
+                )
+                if failure.status == "abandoned":
+                    logger.warning(
+                        f"Giving up on {audio_file.name} after {failure.attempt_count} attempts"
+                    )
+                else:
+                    logger.info(
+                        f"Will retry {audio_file.name} after {failure.next_attempt_at}"
+                    )
                 continue
 
-        logger.info(f"\n\nProcessing complete! Processed {total_files} files.")
+        logger.info(
+            f"\n\nProcessing complete! Processed {processed_files} of {total_files} files."
+        )
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+
+
+class EnhancementBackend(ABC):
+    """Interface for backends that add romanization/translation to lyric lines."""
+
+    # Number of remote LLM requests made so far, used for run budgets
+    llm_call_count = 0
+
+    @abstractmethod
+    def detect_and_enhance_lyric_line(
+        self, lyric_text, file_name, reference_lyrics=None
+    ):
+        """
+        Process a single lyric line to get transliteration and translation.
+
+        Args:
+            lyric_text: Single line of lyrics without timestamp
+            file_name: Name (or tag description) of the song for context
+            reference_lyrics: Embedded lyric lines around this line, if any
+
+        Returns:
+            Newline separated enhancement lines, or "" if nothing to add
+        """
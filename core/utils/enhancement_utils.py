@@ -0,0 +1,96 @@
+from core.common_constants.constants import LYRICS_ENHANCEMENT_MODE
+from core.utils.enhancement_backend import EnhancementBackend
+from core.utils.llm_utils import LLMUtils
+from core.utils.logging_utils import get_logger
+from core.utils.transliteration_utils import (
+    INDIC_SCRIPT_BLOCKS,
+    IndicTransliterator,
+    detect_script,
+)
+
+logger = get_logger(__name__)
+
+ENHANCEMENT_MODES = ("llm", "hybrid", "romanize-only")
+
+
+class LocalTransliterationBackend(EnhancementBackend):
+    """Offline backend that only romanizes Indic scripts."""
+
+    def __init__(self):
+        self.transliterator = IndicTransliterator()
+
+    def romanize(self, lyric_text):
+        """
+        Romanize a line written in a supported Indic script.
+
+        Returns:
+            Romanized line, or None if the line is not in an Indic script
+        """
+        if detect_script(lyric_text) not in INDIC_SCRIPT_BLOCKS:
+            return None
+        return self.transliterator.transliterate(lyric_text).strip()
+
+    def detect_and_enhance_lyric_line(
+        self, lyric_text, file_name, reference_lyrics=None
+    ):
+        return self.romanize(lyric_text) or ""
+
+
+class HybridEnhancementBackend(EnhancementBackend):
+    """
+    Romanize Indic lines locally and ask the LLM for the translation only.
+
+    Lines in other scripts still go through the full LLM enhancement.
+    """
+
+    def __init__(self, llm):
+        """
+        Args:
+            llm: LLMUtils instance used for translation
+        """
+        self.local = LocalTransliterationBackend()
+        self.llm = llm
+
+    @property
+    def llm_call_count(self):
+        return self.llm.llm_call_count
+
+    def detect_and_enhance_lyric_line(
+        self, lyric_text, file_name, reference_lyrics=None
+    ):
+        romanized = self.local.romanize(lyric_text)
+        if romanized is None:
+            return self.llm.detect_and_enhance_lyric_line(
+                lyric_text, file_name, reference_lyrics
+            )
+
+        translation = self.llm.translate_lyric_line(
+            lyric_text, file_name, reference_lyrics
+        )
+        return "\n".join(line for line in (romanized, translation) if line)
+
+
+def get_enhancement_backend(mode=LYRICS_ENHANCEMENT_MODE):
+    """
+    Create the lyric enhancement backend for the configured mode.
+
+    Args:
+        mode: "llm", "hybrid" or "romanize-only"
+
+    Returns:
+        EnhancementBackend instance
+    """
+    mode = mode.lower()
+    logger.info(f"Lyric enhancement mode: {mode}")
+
+    if mode == "romanize-only":
+        return LocalTransliterationBackend()
+
+    if mode == "hybrid":
+        return HybridEnhancementBackend(LLMUtils())
+    if mode == "llm":
+        return LLMUtils()
+
+    raise ValueError(
+        f"Unsupported LYRICS_ENHANCEMENT_MODE: {mode}. Use one of {', '.join(ENHANCEMENT_MODES)}"
+    )
@@ -1,5 +1,6 @@
 from google import genai
 from core.common_constants.constants import GEMINI_API_KEY, GEMINI_MODEL_ID
+from core.utils.enhancement_backend import EnhancementBackend
 
 
 class RateLimitError(Exception):
@@ -8,7 +9,30 @@ class RateLimitError(Exception):
     pass
 
 
-class LLMUtils:
+def raise_if_rate_limited(error):
+    """
+    Convert an API error into RateLimitError if it signals exhausted quota.
+
+    Raises:
+        RateLimitError: If the error is a rate limit or quota error
+    """
+    error_str = str(error).lower()
+    if "rate" in error_str or "quota" in error_str or "429" in error_str:
+        print(f"RATE LIMIT HIT: {error}")
+        raise RateLimitError(f"API rate limit exceeded: {error}") from error
+
+
+def format_reference_lyrics(reference_lyrics):
+    """Prompt section with nearby embedded lyric lines, or "" if there are none."""
+    if not reference_lyrics:
+        return ""
+    return f"""Nearby lines from the song's embedded lyrics (the transcribed lyric may be misheard; use these to correct it):
+{reference_lyrics}
+
+"""
+
+
+class LLMUtils(EnhancementBackend):
     def __init__(self):
         """
         Initialize the Gemini API client.
@@ -16,14 +40,18 @@ class LLMUtils:
         """
         self.client = genai.Client(api_key=GEMINI_API_KEY)
         self.model_id = GEMINI_MODEL_ID
+        self.llm_call_count = 0
 
-    def detect_and_enhance_lyric_line(self, lyric_text, file_name):
+    def detect_and_enhance_lyric_line(
+        self, lyric_text, file_name, reference_lyrics=None
+    ):
         """
         Process a single lyric line to get transliteration and translation.
 
         Args:
             lyric_text: Single line of lyrics without timestamp
             file_name: Name of the audio file for context
+            reference_lyrics: Embedded lyric lines around this line, if any
 
         Returns:
             String with transliteration and translation (2 lines minimum)
@@ -32,7 +60,7 @@ class LLMUtils:
             RateLimitError: If API rate limit is exceeded
         """
         prompt = f"""Song: "{file_name}"
-Lyric: {lyric_text}
+{format_reference_lyrics(reference_lyrics)}Lyric: {lyric_text}
 
 Output exactly 2 lines with NO numbering or labels:
 Line 1: Romanized/transliterated version
@@ -44,6 +72,7 @@ Output:
 tum mere saath ho
 you are with me"""
         try:
+            self.llm_call_count += 1
             response = self.client.models.generate_content(
                 model=self.model_id,
                 contents=prompt,
@@ -79,10 +108,44 @@ you are with me"""
 
         except Exception as e:
             # Check if this is a rate limit error
-            error_str = str(e).lower()
-            if "rate" in error_str or "quota" in error_str or "429" in error_str:
-                print(f"RATE LIMIT HIT: {e}")
-                raise RateLimitError(f"API rate limit exceeded: {e}") from e
+            raise_if_rate_limited(e)
+
+            print(f"Error calling Gemini API for line '{lyric_text}': {e}")
+            return ""
+
+    def translate_lyric_line(
+        self, lyric_text, file_name, reference_lyrics=None
+    ):
+        """
+        Translate a single lyric line to English, without transliteration.
+
+        Args:
+            lyric_text: Single line of lyrics without timestamp
+            file_name: Name of the audio file for context
+            reference_lyrics: Embedded lyric lines around this line, if any
+
+        Returns:
+            English translation as a single line, or "" on error
+
+        Raises:
+            RateLimitError: If API rate limit is exceeded
+        """
+        prompt = f"""Song: "{file_name}"
+{format_reference_lyrics(reference_lyrics)}Lyric: {lyric_text}
+
+Output exactly 1 line with NO numbering or labels: the English translation."""
+        try:
+            self.llm_call_count += 1
+            response = self.client.models.generate_content(
+                model=self.model_id,
+                contents=prompt,
+            )
+            lines = [line.strip() for line in response.text.strip().split("\n")]
+            lines = [line for line in lines if line]
+            return lines[0] if lines else ""
+
+        except Exception as e:
+            raise_if_rate_limited(e)
 
             print(f"Error calling Gemini API for line '{lyric_text}': {e}")
             return ""
@@ -0,0 +1,176 @@
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from core.common_constants.constants import PROFILE_TRACE_PATH
+from core.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_trace_file = None
+_trace_path = None
+_first_event = True
+_trace_lock = threading.Lock()
+_local = threading.local()
+
+# cProfile is only switched on for every Nth track to keep the overhead low
+_cprofile = None
+_cprofile_every = 0
+_track_count = 0
+
+
+def enable_profiling(trace_directory=PROFILE_TRACE_PATH, cprofile_every=0):
+    """
+    Start writing pipeline spans to a Chrome trace file.
+
+    The file is a JSON array with one event per line. It can be opened in
+    chrome://tracing or Perfetto even if the process dies before the
+    closing bracket is written.
+
+    Args:
+        trace_directory: Directory the trace (and cProfile dump) is written to
+        cprofile_every: Run cProfile on every Nth track, 0 to disable
+
+    Returns:
+        Path of the trace file
+    """
+    global _trace_file, _trace_path, _first_event, _cprofile, _cprofile_every
+
+    trace_directory = Path(trace_directory)
+    trace_directory.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    _trace_path = trace_directory / f"verseminer-{timestamp}.trace.json"
+    _trace_file = open(_trace_path, "w", encoding="utf-8")
+    _trace_file.write("[\n")
+    _first_event = True
+
+    _cprofile_every = cprofile_every
+    _cprofile = cProfile.Profile() if cprofile_every else None
+
+    logger.info(f"Profiling enabled, writing trace to {_trace_path}")
+    return _trace_path
+
+
+def is_profiling_enabled():
+    """Return True if spans are being recorded."""
+    return _trace_file is not None
+
+
+def _write_event(event):
+    """Append one trace event to the trace file."""
+    global _first_event
+    line = json.dumps(event, default=str)
+    with _trace_lock:
+        if _trace_file is None:
+            return
+        _trace_file.write(line if _first_event else ",\n" + line)
+        _trace_file.flush()
+        _first_event = False
+
+
+@contextmanager
+def span(name, **args):
+    """
+    Record the duration of a pipeline step.
+
+    Yields a dict that can be filled with extra arguments (such as output
+    sizes) before the span ends. Does nothing unless profiling is enabled.
+
+    Args:
+        name: Step name shown in the trace viewer
+        **args: Arguments attached to the span
+    """
+    if _trace_file is None:
+        yield args
+        return
+
+    start = time.time_ns() // 1000
+    try:
+        yield args
+    finally:
+        duration = time.time_ns() // 1000 - start
+        track_args = getattr(_local, "track_args", None) or {}
+        _write_event(
+            {
+                "name": name,
+                "cat": "pipeline",
+                "ph": "X",
+                "ts": start,
+                "dur": duration,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": {**track_args, **args},
+            }
+        )
+
+
+@contextmanager
+def track(track_id, **metadata):
+    """
+    Mark all spans inside the block as belonging to one track.
+
+    Also wraps the whole track in a "track" span and, when enabled,
+    samples it with cProfile.
+
+    Args:
+        track_id: Identifier of the track (relative file location)
+        **metadata: Track level arguments such as audio duration and size
+    """
+    global _track_count
+
+    if _trace_file is None:
+        yield
+        return
+
+    _local.track_args = {"track": track_id, **metadata}
+    _track_count += 1
+    sample = _cprofile is not None and (_track_count - 1) % _cprofile_every == 0
+    try:
+        with span("track"):
+            if sample:
+                _cprofile.enable()
+            try:
+                yield
+            finally:
+                if sample:
+                    _cprofile.disable()
+    finally:
+        _local.track_args = None
+
+
+def traced(name):
+    """Decorator that records every call of a function as a span."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def finish_profiling():
+    """Close the trace file and write the cProfile statistics, if any."""
+    global _trace_file
+
+    if _trace_file is None:
+        return
+
+    with _trace_lock:
+        _trace_file.write("\n]\n")
+        _trace_file.close()
+        _trace_file = None
+    logger.info(f"Trace written: {_trace_path}")
+
+    if _cprofile is not None:
+        stats_path = _trace_path.with_suffix(".prof")
+        _cprofile.dump_stats(str(stats_path))
+        logger.info(f"cProfile statistics written: {stats_path}")
@@ -0,0 +1,131 @@
+import time
+from pathlib import Path
+from core.common_constants.constants import (
+    MUSIC_ROOT_PATH,
+    SCHEDULE_PRIORITY,
+    SCHEDULE_PRIORITY_DIRECTORIES,
+    RUN_MAX_MINUTES,
+    RUN_MAX_LLM_CALLS,
+)
+from core.utils.logging_utils import get_logger
+from core.utils.tag_utils import TagUtils
+
+logger = get_logger(__name__)
+
+SCHEDULE_PRIORITIES = ("alphabetical", "newest", "shortest")
+
+
+def _modified_time(audio_file):
+    """
+    Modification time of a file.
+
+    ctime is deliberately not used: chmod, chown and renames update it,
+    which would move old files ahead of genuinely new ones.
+    """
+    return Path(audio_file).stat().st_mtime
+
+
+def _priority_directory_rank(audio_file, priority_directories):
+    """Index of the first priority directory containing the file, else len()."""
+    audio_file = Path(audio_file).resolve()
+    for rank, directory in enumerate(priority_directories):
+        if audio_file.is_relative_to(directory):
+            return rank
+    return len(priority_directories)
+
+
+def order_candidates(
+    audio_files,
+    priority=SCHEDULE_PRIORITY,
+    priority_directories=SCHEDULE_PRIORITY_DIRECTORIES,
+    root_directory=MUSIC_ROOT_PATH,
+):
+    """
+    Order the files that still need processing.
+
+    Files inside priority directories come first (in the order the
+    directories are listed), then the rest; each group is sorted by the
+    configured priority.
+
+    Args:
+        audio_files: List of Path objects still to be processed
+        priority: "alphabetical", "newest" or "shortest"
+        priority_directories: Comma separated directories, absolute or
+            relative to root_directory
+        root_directory: Music directory being processed
+
+    Returns:
+        New list of Path objects in processing order
+    """
+    priority = priority.lower()
+    if priority not in SCHEDULE_PRIORITIES:
+        raise ValueError(
+            f"Unsupported SCHEDULE_PRIORITY: {priority}. Use one of {', '.join(SCHEDULE_PRIORITIES)}"
+        )
+
+    # Resolved so "./music" on the command line matches "/abs/path/music"
+    directories = [
+        (Path(root_directory) / d.strip()).resolve()
+        for d in priority_directories.split(",")
+        if d.strip()
+    ]
+
+    if priority == "newest":
+        sort_keys = {f: -_modified_time(f) for f in audio_files}
+    elif priority == "shortest":
+        durations = {f: TagUtils.read_duration(f) for f in audio_files}
+        # Files whose duration cannot be read go last
+        sort_keys = {
+            f: duration if duration is not None else float("inf")
+            for f, duration in durations.items()
+        }
+    else:
+        sort_keys = {f: 0 for f in audio_files}
+
+    return sorted(
+        audio_files,
+        key=lambda f: (
+            _priority_directory_rank(f, directories),
+            sort_keys[f],
+            str(f),
+        ),
+    )
+
+
+class RunBudget:
+    """Wall-clock and LLM call limits for a single processing run."""
+
+    def __init__(
+        self,
+        llm_call_counter,
+        max_minutes=RUN_MAX_MINUTES,
+        max_llm_calls=RUN_MAX_LLM_CALLS,
+    ):
+        """
+        Args:
+            llm_call_counter: Callable returning the total LLM calls made so far
+            max_minutes: Wall-clock limit for the run, 0 for none
+            max_llm_calls: LLM call limit for the run, 0 for none
+        """
+        self.llm_call_counter = llm_call_counter
+        self.start_llm_calls = llm_call_counter()
+        self.max_minutes = max_minutes
+        self.deadline = time.monotonic() + max_minutes * 60 if max_minutes else None
+        self.max_llm_calls = max_llm_calls
+
+    @property
+    def llm_calls_used(self):
+        return self.llm_call_counter() - self.start_llm_calls
+
+    def exhausted_reason(self):
+        """
+        Check whether the run has to stop.
+
+        Returns:
+            Human readable reason if a limit is reached, otherwise None
+        """
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return f"run time limit of {self.max_minutes:g} minutes reached"
+        if self.max_llm_calls and self.llm_calls_used >= self.max_llm_calls:
+            return f"LLM call limit of {self.max_llm_calls} reached"
+        return None
@@ -0,0 +1,108 @@
+import logging
+import os
+import signal
+import threading
+from pathlib import Path
+from core.common_constants.constants import SHUTDOWN_GRACE_SECONDS
+from core.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+_shutdown_event = threading.Event()
+_shutdown_callbacks = []
+_temp_files = set()
+# Re-entrant: the signal handler may force an exit (and clean up) while the
+# main thread it interrupted is already holding the lock
+_temp_files_lock = threading.RLock()
+
+
+class StopRequested(Exception):
+    """
+    Raised inside the pipeline when the current file has to stop early,
+    either for a shutdown signal or because the run budget is used up.
+    """
+
+    def __init__(self, message="Stop requested", partial_result=None):
+        """
+        Args:
+            message: Description of where processing stopped
+            partial_result: Transcription result to checkpoint, if any
+        """
+        super().__init__(message)
+        self.partial_result = partial_result
+
+
+def is_shutdown_requested():
+    """Return True once SIGTERM/SIGINT has been received."""
+    return _shutdown_event.is_set()
+
+
+def add_shutdown_callback(callback):
+    """Register a callable that runs as soon as a shutdown is requested."""
+    _shutdown_callbacks.append(callback)
+
+
+def register_temp_file(path):
+    """Track a temporary file so it is removed even on a forced exit."""
+    with _temp_files_lock:
+        _temp_files.add(Path(path))
+
+
+def unregister_temp_file(path):
+    """Stop tracking a temporary file that has been cleaned up normally."""
+    with _temp_files_lock:
+        _temp_files.discard(Path(path))
+
+
+def cleanup_temp_files():
+    """Delete every tracked temporary file that still exists."""
+    with _temp_files_lock:
+        for path in list(_temp_files):
+            try:
+                path.unlink(missing_ok=True)
+                logger.debug(f"Removed temporary file: {path}")
+            except OSError as e:
+                logger.warning(f"Could not remove temporary file {path}: {e}")
+            _temp_files.discard(path)
+
+
+def _force_exit():
+    """Exit immediately after the grace period, cleaning up what we can."""
+    logger.error(
+        f"Shutdown grace period of {SHUTDOWN_GRACE_SECONDS}s exceeded, forcing exit"
+    )
+    cleanup_temp_files()
+    logging.shutdown()
+    os._exit(1)
+
+
+def _handle_signal(signum, frame):
+    """Signal handler: request a graceful stop, or force it on a second signal."""
+    signal_name = signal.Signals(signum).name
+
+    if _shutdown_event.is_set():
+        logger.warning(f"Received {signal_name} again, exiting immediately")
+        _force_exit()
+
+    logger.warning(
+        f"Received {signal_name}: finishing the current stage, "
+        f"forcing exit in {SHUTDOWN_GRACE_SECONDS}s"
+    )
+    _shutdown_event.set()
+
+    # Daemon timer so a clean exit is never held up by the countdown
+    grace_timer = threading.Timer(SHUTDOWN_GRACE_SECONDS, _force_exit)
+    grace_timer.daemon = True
+    grace_timer.start()
+
+    for callback in _shutdown_callbacks:
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Shutdown callback failed: {e}", exc_info=True)
+
+
+def install_signal_handlers():
+    """Handle SIGTERM (pod eviction) and SIGINT (Ctrl+C) gracefully."""
+    signal.signal(signal.SIGTERM, _handle_signal)
+    signal.signal(signal.SIGINT, _handle_signal)
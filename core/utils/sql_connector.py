@@ -1,5 +1,5 @@
 from pathlib import Path
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from core.common_constants.constants import (
     DB_TYPE,
@@ -43,7 +43,97 @@ def get_session():
     return Session()
 
 
+# Token character classes for FTS5. The unicode61 default (L* N* Co) treats
+# combining marks as separators, which splits Indic words at every vowel sign
+# and virama ("तुम" would be indexed as "त" and "म").
+SQLITE_SEARCH_TOKENIZER = "unicode61 remove_diacritics 2 categories 'L* N* Co M*'"
+
+# Full-text index over lyric_lines: an external-content FTS5 table kept in sync by triggers
+SQLITE_SEARCH_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS lyric_lines_fts USING fts5(
+        original_text, romanization, translation,
+        content='lyric_lines', content_rowid='line_id',
+        tokenize="{SQLITE_SEARCH_TOKENIZER}"
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lyric_lines_ai AFTER INSERT ON lyric_lines BEGIN
+        INSERT INTO lyric_lines_fts(rowid, original_text, romanization, translation)
+        VALUES (new.line_id, new.original_text, new.romanization, new.translation);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lyric_lines_ad AFTER DELETE ON lyric_lines BEGIN
+        INSERT INTO lyric_lines_fts(lyric_lines_fts, rowid, original_text, romanization, translation)
+        VALUES ('delete', old.line_id, old.original_text, old.romanization, old.translation);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS lyric_lines_au AFTER UPDATE ON lyric_lines BEGIN
+        INSERT INTO lyric_lines_fts(lyric_lines_fts, rowid, original_text, romanization, translation)
+        VALUES ('delete', old.line_id, old.original_text, old.romanization, old.translation);
+        INSERT INTO lyric_lines_fts(rowid, original_text, romanization, translation)
+        VALUES (new.line_id, new.original_text, new.romanization, new.translation);
+    END
+    """,
+]
+
+# Full-text index over lyric_lines: a generated tsvector column with a GIN index.
+# The "simple" configuration avoids English stemming of non-English lyrics.
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE lyric_lines ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector(
+            'simple',
+            coalesce(original_text, '') || ' ' ||
+            coalesce(romanization, '') || ' ' ||
+            coalesce(translation, '')
+        )
+    ) STORED
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_lyric_lines_search_vector
+    ON lyric_lines USING GIN (search_vector)
+    """,
+]
+
+
+def _drop_outdated_sqlite_search_index(connection):
+    """
+    Drop a lyric_lines_fts table created with an older tokenizer.
+
+    Returns:
+        True if the table was dropped and has to be rebuilt
+    """
+    existing_sql = connection.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'lyric_lines_fts'")
+    ).scalar()
+    if existing_sql is None or SQLITE_SEARCH_TOKENIZER in existing_sql:
+        return False
+
+    print("Rebuilding lyrics search index with the updated tokenizer")
+    connection.execute(text("DROP TABLE lyric_lines_fts"))
+    return True
+
+
 def init_db():
-    """Initialize the database by creating all tables."""
+    """Initialize the database by creating all tables and the lyrics search index."""
     engine = get_engine()
     Base.metadata.create_all(engine)
+
+    with engine.begin() as connection:
+        if DB_TYPE.lower() == "postgres":
+            for statement in POSTGRES_SEARCH_DDL:
+                connection.execute(text(statement))
+            return
+
+        rebuild = _drop_outdated_sqlite_search_index(connection)
+        for statement in SQLITE_SEARCH_DDL:
+            connection.execute(text(statement))
+        if rebuild:
+            # Re-tokenize every existing row from the lyric_lines content table
+            connection.execute(
+                text("INSERT INTO lyric_lines_fts(lyric_lines_fts) VALUES('rebuild')")
+            )
@@ -1,6 +1,21 @@
-from datetime import datetime
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import func, or_, text
 from sqlalchemy.exc import IntegrityError
-from core.common_constants.models import TranscribedFile
+from core.common_constants.constants import (
+    DB_TYPE,
+    FAILURE_BACKOFF_BASE_HOURS,
+    FAILURE_BACKOFF_MAX_HOURS,
+    FAILURE_MAX_ATTEMPTS,
+)
+from core.common_constants.models import (
+    TranscribedFile,
+    FailedFile,
+    TranscriptionCheckpoint,
+    AudioProbe,
+    EngineMeasurement,
+    LyricLine,
+)
 from core.utils.sql_connector import get_session
 
 
@@ -101,3 +116,409 @@ class SQLUtils:
             session.rollback()
             session.close()
             raise e
+
+    @staticmethod
+    def record_failure(file_location, error_message):
+        """
+        Record a failed processing attempt and schedule the next retry.
+
+        The retry delay doubles with every failure, starting at
+        FAILURE_BACKOFF_BASE_HOURS and capped at FAILURE_BACKOFF_MAX_HOURS.
+        Once FAILURE_MAX_ATTEMPTS is reached the file is abandoned and only
+        retried again after an explicit requeue.
+
+        Returns:
+            The updated FailedFile record
+        """
+        session = get_session()
+        try:
+            now = datetime.now()
+            failure = (
+                session.query(FailedFile).filter_by(file_location=file_location).first()
+            )
+            if failure is None:
+                failure = FailedFile(file_location=file_location, attempt_count=0)
+                session.add(failure)
+
+            failure.attempt_count = (failure.attempt_count or 0) + 1
+            failure.last_error = error_message
+            failure.last_attempt_at = now
+
+            if failure.attempt_count >= FAILURE_MAX_ATTEMPTS:
+                failure.status = "abandoned"
+                failure.next_attempt_at = None
+            else:
+                delay_hours = min(
+                    FAILURE_BACKOFF_BASE_HOURS * 2 ** (failure.attempt_count - 1),
+                    FAILURE_BACKOFF_MAX_HOURS,
+                )
+                failure.status = "retrying"
+                failure.next_attempt_at = now + timedelta(hours=delay_hours)
+
+            session.commit()
+            session.refresh(failure)
+            session.expunge(failure)
+            session.close()
+            return failure
+        except Exception as e:
+            session.rollback()
+            session.close()
+            raise e
+
+    @staticmethod
+    def clear_failure(file_location):
+        """Remove the failure record for a file, e.g. after it succeeded."""
+        session = get_session()
+        try:
+            deleted = (
+                session.query(FailedFile)
+                .filter_by(file_location=file_location)
+                .delete()
+            )
+            session.commit()
+            session.close()
+            return deleted > 0
+        except Exception as e:
+            session.rollback()
+            session.close()
+            raise e
+
+    @staticmethod
+    def get_failed_files():
+        """Get all failure records, most recently failed first."""
+        session = get_session()
+        failures = (
+            session.query(FailedFile)
+            .order_by(FailedFile.last_attempt_at.desc())
+            .all()
+        )
+        session.close()
+        return failures
+
+    @staticmethod
+    def get_blocked_locations(now=None):
+        """
+        Get the locations of files that must not be retried yet.
+
+        A file is blocked while it is still in backoff or once it has been
+        abandoned.
+
+        Returns:
+            Set of file locations
+        """
+        now = now or datetime.now()
+        session = get_session()
+        rows = (
+            session.query(FailedFile.file_location)
+            .filter(
+                or_(
+                    FailedFile.status == "abandoned",
+                    FailedFile.next_attempt_at > now,
+                )
+            )
+            .all()
+        )
+        blocked = {row.file_location for row in rows}
+        session.close()
+        return blocked
+
+    @staticmethod
+    def requeue_failures(file_location=None):
+        """
+        Clear failure records so the files are picked up on the next run.
+
+        Args:
+            file_location: Location to requeue, or None to requeue every file
+
+        Returns:
+            Number of requeued files
+        """
+        session = get_session()
+        try:
+            query = session.query(FailedFile)
+            if file_location is not None:
+                query = query.filter_by(file_location=file_location)
+            requeued = query.delete()
+            session.commit()
+            session.close()
+            return requeued
+        except Exception as e:
+            session.rollback()
+            session.close()
+            raise e
+
+    @staticmethod
+    def save_checkpoint(file_location, transcription_result, lyric_lines=None):
+        """
+        Store a (possibly partial) transcription so a later run can resume it.
+
+        Only the fields needed to resume are kept: language, completion flag,
+        the start/end/text of every segment and the lyric lines that were
+        already enhanced (so their LLM calls are not repeated).
+        """
+        checkpoint_data = json.dumps(
+            {
+                "language": transcription_result.get("language"),
+                "complete": transcription_result.get("complete", False),
+                "text": transcription_result.get("text", ""),
+                "segments": [
+                    {
+                        "start": float(segment["start"]),
+                        "end": float(segment["end"]),
+                        "text": segment["text"],
+                    }
+                    for segment in transcription_result["segments"]
+                ],
+                "lyric_lines": lyric_lines or [],
+            }
+        )
+        session = get_session()
+        try:
+            checkpoint = (
+                session.query(TranscriptionCheckpoint)
+                .filter_by(file_location=file_location)
+                .first()
+            )
+            if checkpoint is None:
+                checkpoint = TranscriptionCheckpoint(file_location=file_location)
+                session.add(checkpoint)
+            checkpoint.checkpoint_data = checkpoint_data
+            session.commit()
+            session.close()
+        except Exception as e:
+            session.rollback()
+            session.close()
+            raise e
+
+    @staticmethod
+    def get_checkpoint(file_location):
+        """
+        Get the saved transcription checkpoint for a file.
+
+        Returns:
+            Transcription result dict, or None if there is no checkpoint
+        """
+        session = get_session()
+        checkpoint = (
+            session.query(TranscriptionCheckpoint)
+            .filter_by(file_location=file_location)
+            .first()
+        )
+        session.close()
+        if checkpoint is None:
+            return None
+        return json.loads(checkpoint.checkpoint_data)
+
+    @staticmethod
+    def delete_checkpoint(file_location):
+        """Delete the transcription checkpoint for a file."""
+        session = get_session()
+        try:
+            deleted = (
+                session.query(TranscriptionCheckpoint)
+                .filter_by(file_location=file_location)
+                .delete()
+            )
+            session.commit()
+            session.close()
+            return deleted > 0
+        except Exception as e:
+            session.rollback()
+            session.close()
+            raise e
+
+    @staticmethod
+    def get_audio_probes():
+        """
+        Get every cached ffprobe result.
+
+        Returns:
+            Dict mapping file location to its AudioProbe record
+        """
+        session = get_session()
+        probes = {probe.file_location: probe for probe in session.query(AudioProbe)}
+        session.close()
+        return probes
+
+    @staticmethod
+    def save_audio_probes(probe_results):
+        """
+        Insert or update cached ffprobe results in a single transaction.
+
+        Args:
+            probe_results: List of dicts with the AudioProbe column values
+        """
+        if not probe_results:
+            return
+        session = get_session()
+        try:
+            existing = {
+                probe.file_location: probe for probe in session.query(AudioProbe)
+            }
+            for probe_result in probe_results:
+                probe = existing.get(probe_result["file_location"])
+                if probe is None:
+                    session.add(AudioProbe(**probe_result))
+                else:
+                    for key, value in probe_result.items():
+                        setattr(probe, key, value)
+            session.commit()
+            session.close()
+        except Exception as e:
+            session.rollback()
+            session.close()
+            raise e
+
+    @staticmethod
+    def add_engine_measurement(
+        file_location,
+        engine,
+        model_name,
+        device,
+        compute_type,
+        audio_seconds,
+        transcribe_seconds,
+        llm_calls,
+    ):
+        """Record how long one file took to transcribe and how many LLM calls it used."""
+        session = get_session()
+        try:
+            session.add(
+                EngineMeasurement(
+                    file_location=file_location,
+                    engine=engine,
+                    model_name=model_name,
+                    device=device,
+                    compute_type=compute_type,
+                    audio_seconds=audio_seconds,
+                    transcribe_seconds=transcribe_seconds,
+                    llm_calls=llm_calls,
+                )
+            )
+            session.commit()
+            session.close()
+        except Exception as e:
+            session.rollback()
+            session.close()
+            raise e
+
+    @staticmethod
+    def get_engine_measurement_totals():
+        """
+        Aggregate the measurements per engine configuration.
+
+        Returns:
+            List of rows with engine, model_name, device, compute_type,
+            files, audio_seconds, transcribe_seconds and llm_calls
+        """
+        session = get_session()
+        rows = (
+            session.query(
+                EngineMeasurement.engine,
+                EngineMeasurement.model_name,
+                EngineMeasurement.device,
+                EngineMeasurement.compute_type,
+                func.count(EngineMeasurement.measurement_id).label("files"),
+                func.sum(EngineMeasurement.audio_seconds).label("audio_seconds"),
+                func.sum(EngineMeasurement.transcribe_seconds).label(
+                    "transcribe_seconds"
+                ),
+                func.sum(EngineMeasurement.llm_calls).label("llm_calls"),
+            )
+            .group_by(
+                EngineMeasurement.engine,
+                EngineMeasurement.model_name,
+                EngineMeasurement.device,
+                EngineMeasurement.compute_type,
+            )
+            .all()
+        )
+        session.close()
+        return rows
+
+    @staticmethod
+    def index_lyrics(file_location, lyric_lines):
+        """
+        Replace the searchable lyric lines of a file.
+
+        The first enhancement line of each lyric is stored as the
+        romanization and the second as the translation.
+
+        Args:
+            file_location: Location of the audio file
+            lyric_lines: Lyric line dicts with start, end, text and enhancements
+        """
+        session = get_session()
+        try:
+            session.query(LyricLine).filter_by(file_location=file_location).delete()
+            for lyric_line in lyric_lines:
+                if not lyric_line["text"]:
+                    continue
+                enhancements = lyric_line["enhancements"]
+                end = lyric_line["end"]
+                session.add(
+                    LyricLine(
+                        file_location=file_location,
+                        start_ms=round(lyric_line["start"] * 1000),
+                        end_ms=round(end * 1000) if end is not None else None,
+                        original_text=lyric_line["text"],
+                        romanization=enhancements[0] if enhancements else None,
+                        translation=enhancements[1] if len(enhancements) > 1 else None,
+                    )
+                )
+            session.commit()
+            session.close()
+        except Exception as e:
+            session.rollback()
+            session.close()
+            raise e
+
+    @staticmethod
+    def search_lyrics(query, limit=50):
+        """
+        Find lyric lines containing a phrase in the original text,
+        romanization or translation.
+
+        Uses FTS5 on SQLite and the tsvector/GIN index on PostgreSQL.
+
+        Args:
+            query: Phrase to search for
+            limit: Maximum number of matching lines
+
+        Returns:
+            List of rows with file_location, start_ms, end_ms, original_text,
+            romanization and translation, best matches first
+        """
+        if DB_TYPE.lower() == "postgres":
+            statement = text(
+                """
+                SELECT file_location, start_ms, end_ms,
+                       original_text, romanization, translation
+                FROM lyric_lines
+                WHERE search_vector @@ phraseto_tsquery('simple', :query)
+                ORDER BY ts_rank(search_vector, phraseto_tsquery('simple', :query)) DESC,
+                         file_location, start_ms
+                LIMIT :limit
+                """
+            )
+            parameters = {"query": query, "limit": limit}
+        else:
+            statement = text(
+                """
+                SELECT l.file_location, l.start_ms, l.end_ms,
+                       l.original_text, l.romanization, l.translation
+                FROM lyric_lines_fts
+                JOIN lyric_lines l ON l.line_id = lyric_lines_fts.rowid
+                WHERE lyric_lines_fts MATCH :query
+                ORDER BY lyric_lines_fts.rank, l.file_location, l.start_ms
+                LIMIT :limit
+                """
+            )
+            # Quote the input as an FTS5 phrase so punctuation is not parsed as syntax
+            phrase = '"' + query.replace('"', '""') + '"'
+            parameters = {"query": phrase, "limit": limit}
+
+        session = get_session()
+        rows = session.execute(statement, parameters).all()
+        session.close()
+        return rows
@@ -0,0 +1,243 @@
+import re
+from difflib import SequenceMatcher
+import mutagen
+from mutagen.asf import ASF
+from mutagen.id3 import ID3
+from mutagen.mp4 import MP4
+from core.common_constants.constants import LLM_REFERENCE_LYRICS_WINDOW
+from core.utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Matches "[mm:ss]", "[mm:ss.xx]" and "[mm:ss.xxx]" LRC timestamps
+LRC_TIMESTAMP_PATTERN = re.compile(r"\[(\d+):(\d{1,2}(?:[.:]\d{1,3})?)\]")
+
+# Tag keys per container, in order of preference
+MP4_KEYS = {
+    "title": ["\xa9nam"],
+    "artist": ["\xa9ART", "aART"],
+    "album": ["\xa9alb"],
+    "lyrics": ["\xa9lyr"],
+}
+VORBIS_KEYS = {
+    "title": ["title"],
+    "artist": ["artist", "albumartist"],
+    "album": ["album"],
+    "lyrics": ["syncedlyrics", "lyrics", "unsyncedlyrics"],
+}
+ASF_KEYS = {
+    "title": ["Title"],
+    "artist": ["Author", "WM/AlbumArtist"],
+    "album": ["WM/AlbumTitle"],
+    "lyrics": ["WM/Lyrics"],
+}
+
+# Similarity below which a transcribed line is placed by position instead
+REFERENCE_MATCH_MIN_RATIO = 0.5
+
+# SYLT timestamp format 2 means absolute milliseconds
+SYLT_FORMAT_MILLISECONDS = 2
+
+
+class TagUtils:
+    @staticmethod
+    def empty_tags():
+        """Return a tag dict with every field unset."""
+        return {
+            "title": None,
+            "artist": None,
+            "album": None,
+            "synced_lyrics": None,
+            "unsynced_lyrics": None,
+        }
+
+    @staticmethod
+    def parse_lrc_lyrics(lyrics_text):
+        """
+        Parse LRC formatted lyrics into timed lines.
+
+        Lines with several timestamps ("[00:12.00][01:30.00]chorus") are
+        expanded into one entry per timestamp.
+
+        Args:
+            lyrics_text: Lyrics text that may contain LRC timestamps
+
+        Returns:
+            List of (seconds, text) tuples sorted by time, or None if the
+            text carries no timestamps
+        """
+        timed_lines = []
+        for line in lyrics_text.splitlines():
+            timestamps = LRC_TIMESTAMP_PATTERN.findall(line)
+            if not timestamps:
+                continue
+            text = LRC_TIMESTAMP_PATTERN.sub("", line).strip()
+            for minutes, seconds in timestamps:
+                seconds = float(seconds.replace(":", "."))
+                timed_lines.append((int(minutes) * 60 + seconds, text))
+
+        if not timed_lines:
+            return None
+        return sorted(timed_lines, key=lambda timed_line: timed_line[0])
+
+    @staticmethod
+    def _first_value(tags, keys):
+        """Return the first non-empty value for any of the given keys."""
+        for key in keys:
+            values = tags.get(key)
+            if not values:
+                continue
+            value = values[0] if isinstance(values, list) else values
+            value = str(value).strip()
+            if value:
+                return value
+        return None
+
+    @staticmethod
+    def _read_id3(tags, result):
+        """Fill the result from ID3 frames (MP3, and ID3-tagged WAV/AAC)."""
+        for field, frame_id in (
+            ("title", "TIT2"),
+            ("artist", "TPE1"),
+            ("album", "TALB"),
+        ):
+            frame = tags.get(frame_id)
+            if frame and frame.text:
+                result[field] = str(frame.text[0]).strip() or None
+
+        for frame in tags.getall("SYLT"):
+            if frame.format != SYLT_FORMAT_MILLISECONDS or not frame.text:
+                continue
+            result["synced_lyrics"] = [
+                (milliseconds / 1000, text.strip())
+                for text, milliseconds in frame.text
+            ]
+            break
+
+        for frame in tags.getall("USLT"):
+            if frame.text and frame.text.strip():
+                result["unsynced_lyrics"] = frame.text.strip()
+                break
+
+    @staticmethod
+    def read_tags(audio_file_path):
+        """
+        Read title, artist, album and embedded lyrics from an audio file.
+
+        Supports ID3 (MP3), MP4/M4A, Vorbis comments (FLAC, Ogg, Opus) and
+        ASF (WMA). Lyrics stored as plain text that carry LRC timestamps
+        are treated as synced lyrics.
+
+        Args:
+            audio_file_path: Path to the audio file
+
+        Returns:
+            Dict with title, artist, album, synced_lyrics (list of
+            (seconds, text) tuples) and unsynced_lyrics; unknown fields
+            are None
+        """
+        result = TagUtils.empty_tags()
+        try:
+            audio = mutagen.File(str(audio_file_path))
+        except Exception as e:
+            logger.warning(f"Could not read tags from {audio_file_path}: {e}")
+            return result
+
+        if audio is None or audio.tags is None:
+            return result
+
+        tags = audio.tags
+        if isinstance(tags, ID3):
+            TagUtils._read_id3(tags, result)
+        else:
+            if isinstance(audio, MP4):
+                keys = MP4_KEYS
+            elif isinstance(audio, ASF):
+                keys = ASF_KEYS
+            else:
+                keys = VORBIS_KEYS
+            for field in ("title", "artist", "album"):
+                result[field] = TagUtils._first_value(tags, keys[field])
+            result["unsynced_lyrics"] = TagUtils._first_value(tags, keys["lyrics"])
+
+        # Plain-text lyrics frequently contain a complete LRC file
+        if result["synced_lyrics"] is None and result["unsynced_lyrics"]:
+            synced = TagUtils.parse_lrc_lyrics(result["unsynced_lyrics"])
+            if synced:
+                result["synced_lyrics"] = synced
+                result["unsynced_lyrics"] = None
+
+        return result
+
+    @staticmethod
+    def read_duration(audio_file_path):
+        """
+        Read the audio duration from the file headers.
+
+        Returns:
+            Duration in seconds, or None if it cannot be determined
+        """
+        try:
+            audio = mutagen.File(str(audio_file_path))
+        except Exception as e:
+            logger.warning(f"Could not read duration of {audio_file_path}: {e}")
+            return None
+        if audio is None or audio.info is None:
+            return None
+        return audio.info.length
+
+    @staticmethod
+    def describe(tags, file_name):
+        """
+        Build a short song description for LLM context.
+
+        Args:
+            tags: Tag dict from read_tags
+            file_name: Audio file name, used when tags are missing
+
+        Returns:
+            String such as 'Title - Artist (Album)' or the file name
+        """
+        if not tags.get("title"):
+            return file_name
+        description = tags["title"]
+        if tags.get("artist"):
+            description += f" - {tags['artist']}"
+        if tags.get("album"):
+            description += f" ({tags['album']})"
+        return description
+
+    @staticmethod
+    def reference_excerpt(
+        reference_lines, lyric_text, position, window=LLM_REFERENCE_LYRICS_WINDOW
+    ):
+        """
+        Pick the embedded lyric lines around the line being enhanced.
+
+        The line is located by its closest match in the reference lyrics,
+        falling back to its relative position in the song when nothing
+        matches well. Only a small window is returned because it is sent
+        with every LLM call.
+
+        Args:
+            reference_lines: Non-empty lines of the embedded unsynced lyrics
+            lyric_text: Transcribed line being enhanced
+            position: Relative position of the line in the song (0.0 to 1.0)
+            window: Lines to include on each side, 0 to disable
+
+        Returns:
+            Newline separated excerpt, or None
+        """
+        if not reference_lines or not window:
+            return None
+
+        scores = [
+            SequenceMatcher(None, lyric_text.lower(), line.lower()).ratio()
+            for line in reference_lines
+        ]
+        best = max(range(len(scores)), key=scores.__getitem__)
+        if scores[best] < REFERENCE_MATCH_MIN_RATIO:
+            best = round(position * (len(reference_lines) - 1))
+
+        start = max(0, best - window)
+        return "\n".join(reference_lines[start : best + window + 1])
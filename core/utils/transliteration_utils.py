@@ -0,0 +1,395 @@
+import unicodedata
+
+# Unicode blocks of the supported Brahmic scripts. The blocks share the ISCII
+# layout, so the same offset is the same letter in every script.
+INDIC_SCRIPT_BLOCKS = {
+    "devanagari": 0x0900,
+    "bengali": 0x0980,
+    "gurmukhi": 0x0A00,
+    "gujarati": 0x0A80,
+    "oriya": 0x0B00,
+    "tamil": 0x0B80,
+    "telugu": 0x0C00,
+    "kannada": 0x0C80,
+    "malayalam": 0x0D00,
+}
+
+# Scripts whose languages drop the inherent vowel at the end of words and
+# between syllables ("tum", not "tuma")
+SCHWA_DELETING_SCRIPTS = {"devanagari", "gurmukhi", "gujarati", "bengali"}
+
+INDEPENDENT_VOWELS = {
+    0x05: "a",
+    0x06: "aa",
+    0x07: "i",
+    0x08: "ee",
+    0x09: "u",
+    0x0A: "oo",
+    0x0B: "ri",
+    0x0C: "lri",
+    0x0D: "e",
+    0x0E: "e",
+    0x0F: "e",
+    0x10: "ai",
+    0x11: "o",
+    0x12: "o",
+    0x13: "o",
+    0x14: "au",
+    0x60: "ri",
+    0x61: "lri",
+}
+
+CONSONANTS = {
+    0x15: "k",
+    0x16: "kh",
+    0x17: "g",
+    0x18: "gh",
+    0x19: "n",
+    0x1A: "ch",
+    0x1B: "chh",
+    0x1C: "j",
+    0x1D: "jh",
+    0x1E: "n",
+    0x1F: "t",
+    0x20: "th",
+    0x21: "d",
+    0x22: "dh",
+    0x23: "n",
+    0x24: "t",
+    0x25: "th",
+    0x26: "d",
+    0x27: "dh",
+    0x28: "n",
+    0x29: "n",
+    0x2A: "p",
+    0x2B: "ph",
+    0x2C: "b",
+    0x2D: "bh",
+    0x2E: "m",
+    0x2F: "y",
+    0x30: "r",
+    0x31: "r",
+    0x32: "l",
+    0x33: "l",
+    0x34: "zh",
+    0x35: "v",
+    0x36: "sh",
+    0x37: "sh",
+    0x38: "s",
+    0x39: "h",
+    # Precomposed nukta letters
+    0x58: "q",
+    0x59: "kh",
+    0x5A: "gh",
+    0x5B: "z",
+    0x5C: "r",
+    0x5D: "rh",
+    0x5E: "f",
+    0x5F: "y",
+}
+
+# Romanization of a consonant followed by the nukta sign
+NUKTA_CONSONANTS = {
+    0x15: "q",
+    0x16: "kh",
+    0x17: "gh",
+    0x1C: "z",
+    0x21: "r",
+    0x22: "rh",
+    0x2B: "f",
+    0x2F: "y",
+}
+
+VOWEL_SIGNS = {
+    0x3E: "aa",
+    0x3F: "i",
+    0x40: "ee",
+    0x41: "u",
+    0x42: "oo",
+    0x43: "ri",
+    0x44: "ri",
+    0x45: "e",
+    0x46: "e",
+    0x47: "e",
+    0x48: "ai",
+    0x49: "o",
+    0x4A: "o",
+    0x4B: "o",
+    0x4C: "au",
+    0x57: "au",
+    0x62: "lri",
+    0x63: "lri",
+}
+
+OTHER_SIGNS = {
+    0x3D: "'",  # avagraha
+    0x4E: "t",  # Bengali khanda ta
+    0x50: "om",
+    0x64: ".",  # danda
+    0x65: ".",  # double danda
+}
+
+CANDRABINDU = 0x01
+ANUSVARA = 0x02
+VISARGA = 0x03
+NUKTA = 0x3C
+VIRAMA = 0x4D
+DIGIT_ZERO = 0x66
+
+# Script specific letters outside the shared layout
+GURMUKHI_TIPPI = 0x0A70
+GURMUKHI_ADDAK = 0x0A71
+GURMUKHI_VOWEL_CARRIERS = {0x0A72, 0x0A73}
+MALAYALAM_CHILLU = {
+    0x0D7A: "n",
+    0x0D7B: "n",
+    0x0D7C: "r",
+    0x0D7D: "l",
+    0x0D7E: "l",
+    0x0D7F: "k",
+}
+ZERO_WIDTH_JOINERS = {0x200C, 0x200D}
+
+# Long vowels are written short at the end of a word ("mera", "kabhi", "tu")
+WORD_FINAL_VOWELS = {"aa": "a", "ee": "i", "oo": "u"}
+
+# Consonants before which an anusvara sounds like "m"
+LABIAL_PREFIXES = ("p", "b", "m")
+
+# Scripts whose word-final anusvara is "m" ("namaskaaram", "malayaalam")
+FINAL_M_ANUSVARA_SCRIPTS = {"telugu", "kannada", "malayalam", "tamil"}
+
+# Bengali ং is a velar nasal ("bangla", "rong")
+VELAR_ANUSVARA_SCRIPTS = {"bengali"}
+
+
+def get_indic_script(char):
+    """
+    Return the Indic script name of a character, or None.
+
+    Args:
+        char: Single character
+
+    Returns:
+        Script name from INDIC_SCRIPT_BLOCKS, or None for other characters
+    """
+    code = ord(char)
+    for script, block_start in INDIC_SCRIPT_BLOCKS.items():
+        if block_start <= code < block_start + 0x80:
+            return script
+    return None
+
+
+def detect_script(text):
+    """
+    Classify the dominant writing system of a text.
+
+    Args:
+        text: Text to classify
+
+    Returns:
+        An Indic script name, "latin", "other", or None when the text has
+        no letters at all
+    """
+    counts = {}
+    for char in text:
+        if not unicodedata.category(char).startswith(("L", "M")):
+            continue
+        script = get_indic_script(char)
+        if script is None:
+            is_latin = unicodedata.name(char, "").startswith("LATIN")
+            script = "latin" if is_latin else "other"
+        counts[script] = counts.get(script, 0) + 1
+
+    if not counts:
+        return None
+    return max(counts, key=counts.get)
+
+
+class IndicTransliterator:
+    """
+    Rule-based romanizer for the common Brahmic scripts.
+
+    Produces the informal romanization used in song lyrics ("tum mere saath
+    ho") rather than a scholarly scheme such as ISO 15919.
+    """
+
+    def transliterate(self, text):
+        """
+        Romanize every Indic word in a text, leaving everything else as-is.
+
+        Args:
+            text: Text that may contain Indic scripts
+
+        Returns:
+            Romanized text
+        """
+        output = []
+        word = []
+        word_script = None
+
+        for char in text:
+            script = get_indic_script(char)
+            if script is not None or (word and ord(char) in ZERO_WIDTH_JOINERS):
+                if word and script is not None and script != word_script:
+                    output.append(self._transliterate_word(word, word_script))
+                    word = []
+                word_script = script or word_script
+                word.append(char)
+                continue
+
+            if word:
+                output.append(self._transliterate_word(word, word_script))
+                word = []
+            output.append(char)
+
+        if word:
+            output.append(self._transliterate_word(word, word_script))
+
+        return "".join(output)
+
+    def _parse_units(self, word, script):
+        """
+        Split a word into units of consonant, vowel and trailing signs.
+
+        Returns:
+            List of dicts with "consonant", "vowel" (None when the inherent
+            vowel applies, "" when suppressed) and "suffix" keys
+        """
+        block_start = INDIC_SCRIPT_BLOCKS[script]
+        units = []
+        geminate_next = False
+
+        for char in word:
+            code = ord(char)
+            offset = code - block_start
+            last = units[-1] if units else None
+
+            if code in ZERO_WIDTH_JOINERS:
+                continue
+
+            if code == GURMUKHI_ADDAK:
+                geminate_next = True
+                continue
+
+            if code in GURMUKHI_VOWEL_CARRIERS:
+                units.append({"consonant": "", "vowel": None, "suffix": ""})
+            elif code in MALAYALAM_CHILLU:
+                units.append(
+                    {"consonant": MALAYALAM_CHILLU[code], "vowel": "", "suffix": ""}
+                )
+            elif offset in CONSONANTS:
+                consonant = CONSONANTS[offset]
+                if geminate_next:
+                    consonant = consonant[0] + consonant
+                    geminate_next = False
+                units.append(
+                    {
+                        "consonant": consonant,
+                        "offset": offset,
+                        "vowel": None,
+                        "suffix": "",
+                    }
+                )
+            elif offset in INDEPENDENT_VOWELS:
+                units.append(
+                    {"consonant": "", "vowel": INDEPENDENT_VOWELS[offset], "suffix": ""}
+                )
+            elif offset == NUKTA and last and last.get("offset") in NUKTA_CONSONANTS:
+                last["consonant"] = NUKTA_CONSONANTS[last["offset"]]
+            elif offset in VOWEL_SIGNS and last and last["vowel"] is None:
+                last["vowel"] = VOWEL_SIGNS[offset]
+            elif offset == VIRAMA and last:
+                last["vowel"] = ""
+            elif offset == ANUSVARA:
+                if last:
+                    last["anusvara"] = True
+            elif offset == CANDRABINDU or code == GURMUKHI_TIPPI:
+                if last:
+                    last["suffix"] += "n"
+            elif offset == VISARGA:
+                if last:
+                    last["suffix"] += "h"
+            elif DIGIT_ZERO <= offset <= DIGIT_ZERO + 9:
+                units.append(
+                    {"consonant": str(offset - DIGIT_ZERO), "vowel": "", "suffix": ""}
+                )
+            elif offset in OTHER_SIGNS:
+                units.append(
+                    {"consonant": OTHER_SIGNS[offset], "vowel": "", "suffix": ""}
+                )
+
+        return units
+
+    def _apply_schwa_deletion(self, units):
+        """
+        Drop inherent vowels that are silent in Hindi-like languages.
+
+        The final inherent vowel of a word is dropped, and a medial one is
+        dropped when it sits between two vowel-bearing syllables
+        ("samajhna", "dilwale").
+        """
+        inherent = [unit["vowel"] is None for unit in units]
+
+        # Single-syllable words such as "na" keep their vowel
+        if len(units) > 1 and inherent[-1] and units[-1]["consonant"]:
+            units[-1]["vowel"] = ""
+
+        for idx in range(len(units) - 2, 0, -1):
+            unit = units[idx]
+            if unit["vowel"] is not None or not unit["consonant"]:
+                continue
+            previous_unit = units[idx - 1]
+            next_unit = units[idx + 1]
+            previous_voiced = previous_unit["vowel"] != ""
+            next_voiced = next_unit["consonant"] and next_unit["vowel"] != ""
+            if previous_voiced and next_voiced:
+                unit["vowel"] = ""
+
+    def _transliterate_word(self, word, script):
+        """Romanize a single word written in one Indic script."""
+        units = self._parse_units(word, script)
+        if script in SCHWA_DELETING_SCRIPTS:
+            self._apply_schwa_deletion(units)
+
+        parts = []
+        for idx, unit in enumerate(units):
+            vowel = "a" if unit["vowel"] is None else unit["vowel"]
+            if idx == len(units) - 1 and unit["consonant"]:
+                vowel = WORD_FINAL_VOWELS.get(vowel, vowel)
+            next_unit = units[idx + 1] if idx + 1 < len(units) else None
+            suffix = unit["suffix"]
+            if unit.get("anusvara"):
+                suffix = self._romanize_anusvara(script, next_unit) + suffix
+            elif suffix.startswith("n") and next_unit:
+                if next_unit["consonant"].startswith(LABIAL_PREFIXES):
+                    suffix = "m" + suffix[1:]
+            parts.append(unit["consonant"] + vowel + suffix)
+
+        return "".join(parts)
+
+    @staticmethod
+    def _romanize_anusvara(script, next_unit):
+        """
+        Romanize an anusvara from the script and the consonant that follows.
+
+        Args:
+            script: Script of the word
+            next_unit: Unit after the anusvara, or None at the end of a word
+
+        Returns:
+            "m", "ng" or "n"
+        """
+        next_consonant = next_unit["consonant"] if next_unit else ""
+
+        # Before a velar the following "k"/"g" already completes the velar
+        # nasal ("ganga", "shankar", "bengaluru"); "ng" would double it
+        if next_consonant.startswith(("k", "g")):
+            return "n"
+        if script in VELAR_ANUSVARA_SCRIPTS:
+            return "ng"
+        if next_unit is None:
+            return "m" if script in FINAL_M_ANUSVARA_SCRIPTS else "n"
+        if next_consonant.startswith(LABIAL_PREFIXES):
+            return "m"
+        return "n"
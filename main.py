@@ -2,13 +2,28 @@ import argparse
 import time
 from pathlib import Path
 from apscheduler.schedulers.blocking import BlockingScheduler
+from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
-from core.common_constants.constants import MUSIC_ROOT_PATH
+from core.common_constants.constants import (
+    MUSIC_ROOT_PATH,
+    SCHEDULE_START_TIME,
+    WHISPER_PROFILE_PATH,
+)
+from core.src.AutoTuner import AutoTuner
+from core.src.CapacityPlanner import CapacityPlanner
 from core.src.LyricsGenerator import LyricsGenerator
 from core.utils.sql_connector import init_db
 from core.utils.llm_utils import RateLimitError
+from core.utils.sql_utils import SQLUtils
 from core.utils.logging_utils import get_logger
+from core.utils.profiling_utils import enable_profiling, finish_profiling
+from core.utils.shutdown_utils import (
+    add_shutdown_callback,
+    cleanup_temp_files,
+    install_signal_handlers,
+    is_shutdown_requested,
+)
 
 logger = get_logger(__name__)
 
@@ -30,7 +45,10 @@ def process_directory_scheduled(directory):
         generator.process_directory(directory)
 
         logger.info("=" * 60)
-        logger.info("Scheduled run completed successfully")
+        if is_shutdown_requested():
+            logger.info("Scheduled run stopped early for shutdown")
+        else:
+            logger.info("Scheduled run completed successfully")
         logger.info("=" * 60)
 
     except RateLimitError as e:
@@ -47,6 +65,114 @@ def process_directory_scheduled(directory):
         logger.error("=" * 60)
 
 
+def list_failed_files():
+    """Print every file that is in retry backoff or has been abandoned."""
+    failures = SQLUtils.get_failed_files()
+    if not failures:
+        print("No failed files recorded")
+        return
+
+    print(f"{len(failures)} failed files:")
+    for failure in failures:
+        next_attempt = failure.next_attempt_at or "never (requeue to retry)"
+        print("-" * 60)
+        print(f"File:         {failure.file_location}")
+        print(f"Status:       {failure.status} ({failure.attempt_count} attempts)")
+        print(f"Last attempt: {failure.last_attempt_at}")
+        print(f"Next attempt: {next_attempt}")
+        print(f"Last error:   {failure.last_error}")
+
+
+def requeue_failed_files(file_location):
+    """
+    Clear failure records so the files are retried on the next run.
+
+    Args:
+        file_location: Stored file location to requeue, or "all"
+    """
+    if file_location == "all":
+        requeued = SQLUtils.requeue_failures()
+    else:
+        requeued = SQLUtils.requeue_failures(file_location)
+    print(f"Requeued {requeued} failed files")
+
+
+def search_lyrics(query, limit):
+    """
+    Print the tracks containing a lyric phrase, with match timestamps.
+
+    Args:
+        query: Phrase to search for
+        limit: Maximum number of matching lines
+    """
+    rows = SQLUtils.search_lyrics(query, limit)
+    if not rows:
+        print(f"No lyrics found for: {query}")
+        return
+
+    # Group matching lines by track, keeping the best-ranked track first
+    matches = {}
+    for row in rows:
+        matches.setdefault(row.file_location, []).append(row)
+
+    print(f"{len(rows)} matching lines in {len(matches)} tracks:")
+    for file_location, track_rows in matches.items():
+        print("-" * 60)
+        print(file_location)
+        for row in track_rows:
+            print(f"  [{row.start_ms} ms] {row.original_text}")
+            for extra in (row.romanization, row.translation):
+                if extra:
+                    print(f"      {extra}")
+
+
+def reindex_lyrics(directory):
+    """
+    Rebuild the lyrics search index from the LRC files already on disk.
+
+    Args:
+        directory: Root directory containing audio and LRC files
+    """
+    indexed = 0
+    for audio_file in LyricsGenerator.get_all_audio_files(directory):
+        lrc_file_path = audio_file.with_suffix(".lrc")
+        if not lrc_file_path.exists():
+            continue
+        lyric_lines = LyricsGenerator.lyric_lines_from_lrc(
+            lrc_file_path.read_text(encoding="utf-8")
+        )
+        relative_path = LyricsGenerator.get_relative_path(audio_file)
+        SQLUtils.index_lyrics(relative_path, lyric_lines)
+        indexed += 1
+    print(f"Indexed lyrics of {indexed} files")
+
+
+def run_autotune(directory):
+    """
+    Benchmark the available Whisper configurations and write the profile.
+
+    Args:
+        directory: Music directory used for the calibration corpus
+    """
+    print("=" * 60)
+    print("Whisper autotune - benchmarking engine configurations")
+    print("=" * 60)
+
+    best = AutoTuner().run(directory)
+    if best is None:
+        print("Autotune failed - no profile written")
+        return
+
+    candidate = best["candidate"]
+    print("=" * 60)
+    print(f"Best configuration: {candidate}")
+    print(
+        f"Real-time factor: {best['real_time_factor']:.3f}, accuracy: {best['accuracy']:.3f}"
+    )
+    print(f"Profile saved to {WHISPER_PROFILE_PATH}")
+    print("=" * 60)
+
+
 def main():
     """Main entry point for the LRC generator with 24-hour scheduling."""
     parser = argparse.ArgumentParser(
@@ -63,9 +189,73 @@ def main():
         action="store_true",
         help="Run once and exit instead of scheduling every 24 hours",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record a per-track trace of every pipeline step (Chrome trace format) under PROFILE_TRACE_PATH",
+    )
+    parser.add_argument(
+        "--profile-cprofile",
+        type=int,
+        default=0,
+        metavar="N",
+        help="With --profile, also run cProfile on every Nth track",
+    )
+    parser.add_argument(
+        "--failed",
+        action="store_true",
+        help="List files that failed processing and exit",
+    )
+    parser.add_argument(
+        "--requeue",
+        nargs="?",
+        const="all",
+        metavar="FILE_LOCATION",
+        help="Clear the failure record of FILE_LOCATION (as shown by --failed), or of all files, and exit",
+    )
+    parser.add_argument(
+        "--search",
+        metavar="PHRASE",
+        help="Search the transcribed lyrics for a phrase and exit",
+    )
+    parser.add_argument(
+        "--search-limit",
+        type=int,
+        default=50,
+        metavar="N",
+        help="Maximum number of matching lines for --search (default: 50)",
+    )
+    parser.add_argument(
+        "--reindex",
+        action="store_true",
+        help="Rebuild the lyrics search index from existing LRC files and exit",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Probe the files still to be processed, print projected runtime and LLM calls and exit",
+    )
+    parser.add_argument(
+        "--autotune",
+        action="store_true",
+        help="Benchmark the Whisper configurations available on this host, save the fastest accurate one to the profile file and exit",
+    )
 
     args = parser.parse_args()
 
+    if args.search:
+        init_db()
+        search_lyrics(args.search, args.search_limit)
+        return
+
+    if args.failed or args.requeue:
+        init_db()
+        if args.failed:
+            list_failed_files()
+        if args.requeue:
+            requeue_failed_files(args.requeue)
+        return
+
     # Validate directory
     directory = Path(args.directory)
     if not directory.exists():
@@ -76,6 +266,20 @@ def main():
         print(f"Error: Path is not a directory: {directory}")
         return
 
+    if args.autotune:
+        run_autotune(directory)
+        return
+
+    if args.plan:
+        init_db()
+        CapacityPlanner().run(directory)
+        return
+
+    if args.reindex:
+        init_db()
+        reindex_lyrics(directory)
+        return
+
     print("=" * 60)
     print("LRC File Generator - Using Whisper + Gemini")
     print("=" * 60)
@@ -86,24 +290,49 @@ def main():
     init_db()
     print("Database initialized successfully\n")
 
+    # SIGTERM (pod eviction) and Ctrl+C stop after the current stage
+    install_signal_handlers()
+
+    if args.profile:
+        enable_profiling(cprofile_every=args.profile_cprofile)
+
     # If --once flag is set, run once and exit
     if args.once:
         logger.info("Running in single-run mode (--once)")
         process_directory_scheduled(directory)
+        cleanup_temp_files()
+        finish_profiling()
         return
 
-    # Otherwise, schedule to run every 24 hours
-    logger.info("Starting scheduler - will run immediately and every 24 hours")
+    if SCHEDULE_START_TIME:
+        # Run daily inside a fixed window (e.g. off-peak GPU hours or after the LLM quota resets)
+        hour, minute = (int(part) for part in SCHEDULE_START_TIME.split(":"))
+        trigger = CronTrigger(hour=hour, minute=minute)
+        schedule_description = f"daily at {SCHEDULE_START_TIME}"
+        logger.info(f"Starting scheduler - will run {schedule_description}")
+    else:
+        # Otherwise, schedule to run every 24 hours
+        trigger = IntervalTrigger(hours=24)
+        schedule_description = "again in 24 hours"
+        logger.info("Starting scheduler - will run immediately and every 24 hours")
+
+        # Run immediately first
+        process_directory_scheduled(directory)
 
-    # Run immediately first
-    process_directory_scheduled(directory)
+        if is_shutdown_requested():
+            cleanup_temp_files()
+            finish_profiling()
+            print("Shutdown requested - exiting")
+            return
 
     scheduler = BlockingScheduler()
 
-    # Schedule the job to run every 24 hours after the initial run
+    # Stop the scheduler loop on SIGTERM; a running job finishes its current stage first
+    add_shutdown_callback(lambda: scheduler.shutdown(wait=False))
+
     scheduler.add_job(
         process_directory_scheduled,
-        IntervalTrigger(hours=24),
+        trigger,
         args=[directory],
         id="lrc_generation",
         name="LRC Generation Job",
@@ -111,18 +340,20 @@ def main():
     )
 
     print("=" * 60)
-    print("Scheduler started - running again in 24 hours")
+    print(f"Scheduler started - running {schedule_description}")
     print("Press Ctrl+C to stop")
     print("=" * 60)
 
-    try:
-        # Run the scheduler (blocking - continues indefinitely)
-        scheduler.start()
-    except KeyboardInterrupt:
-        print("\n" + "=" * 60)
-        print("Scheduler stopped by user")
-        print("=" * 60)
-        scheduler.shutdown()
+    # Run the scheduler (blocking - continues until a shutdown signal).
+    # Ctrl+C does not raise KeyboardInterrupt here: SIGINT is handled by
+    # shutdown_utils, whose callback above stops the scheduler.
+    scheduler.start()
+
+    # A job still running in the executor cleans up its own temp files
+    finish_profiling()
+    print("\n" + "=" * 60)
+    print("Scheduler stopped")
+    print("=" * 60)
 
 
 def main_legacy():